@@ -0,0 +1,173 @@
+"""On-disk cache of GitHub REST API responses shared by the watcher scripts."""
+
+import os
+import json
+import time
+import threading
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+# Path to the cache file
+CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "assets",
+    "cache.json"
+)
+
+# REST endpoints cached per repo
+ENDPOINTS = {
+    'repo': "https://api.github.com/repos/{repo}",
+    'release': "https://api.github.com/repos/{repo}/releases/latest",
+}
+
+# Seconds a cached response is served without revalidation. Star counts
+# drift slowly and release tags are effectively immutable once published.
+TTL = {
+    'repo': 5 * 60,
+    'release': 24 * 60 * 60,
+}
+
+# Response fields kept per endpoint (everything else is dropped)
+FIELDS = {
+    'repo': ('stargazers_count',),
+    'release': ('tag_name', 'name', 'body', 'published_at', 'author'),
+}
+
+_entries = None
+_lock = threading.Lock()
+
+def _read_file(f):
+    """Parse an open cache file, treating a missing/corrupt file as empty."""
+    try:
+        data = json.load(f)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _load():
+    """Load the cache file once per process."""
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, "r") as f:
+                _entries = _read_file(f)
+        except FileNotFoundError:
+            _entries = {}
+    return _entries
+
+def _is_fresh(entry, endpoint):
+    """Whether a cache entry is younger than its endpoint's TTL."""
+    return bool(entry) and time.time() - entry.get('fetched_at', 0) < TTL[endpoint]
+
+def _trim(endpoint, data):
+    """Keep only the fields the scripts read from a response."""
+    trimmed = {key: data.get(key) for key in FIELDS[endpoint]}
+    if endpoint == 'release':
+        trimmed['author'] = {'login': (data.get('author') or {}).get('login', 'Unknown')}
+    return trimmed
+
+def _store_all(entries):
+    """Record (repo, endpoint, entry) triples in memory and merge them into the cache file."""
+    with _lock:
+        for repo, endpoint, entry in entries:
+            _load().setdefault(repo, {})[endpoint] = entry
+
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, "a+") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            # Merge with whatever other processes wrote since we loaded
+            f.seek(0)
+            on_disk = _read_file(f)
+            for repo, endpoint, entry in entries:
+                on_disk.setdefault(repo, {})[endpoint] = entry
+            f.seek(0)
+            f.truncate()
+            json.dump(on_disk, f)
+
+def _store(repo, endpoint, entry):
+    """Record an entry in memory and merge it into the cache file."""
+    _store_all([(repo, endpoint, entry)])
+
+def remember(responses):
+    """Cache responses fetched some other way than fetch() (e.g. gh GraphQL).
+
+    Args:
+        responses: dict of (repo, endpoint) -> response data shaped like the
+            REST endpoint's, or None for a release endpoint that would 404
+    """
+    now = time.time()
+    _store_all([
+        (repo, endpoint, {
+            'data': None if data is None else _trim(endpoint, data),
+            'etag': None,
+            'fetched_at': now
+        })
+        for (repo, endpoint), data in responses.items()
+    ])
+
+def lookup(repo, endpoint):
+    """Return the cached entry for (repo, endpoint) if it is still fresh.
+
+    Returns:
+        dict: {'data', 'etag', 'fetched_at'} or None if missing or stale
+    """
+    entry = _load().get(repo, {}).get(endpoint)
+    return entry if _is_fresh(entry, endpoint) else None
+
+def known(repo, endpoint):
+    """Whether any response, fresh or stale, is cached for (repo, endpoint)."""
+    return bool(_load().get(repo, {}).get(endpoint))
+
+def fetch(repo, endpoint):
+    """GET a GitHub REST endpoint for a repo through the cache.
+
+    Fresh entries are returned without touching the network. Stale entries
+    are revalidated with If-None-Match; a 304 only bumps their timestamp,
+    costing neither a response body nor rate limit.
+
+    A 404 from the release endpoint is cached too, as None, so repos
+    without releases are not asked again until the entry goes stale.
+
+    Args:
+        repo: Repository in owner/repo format
+        endpoint: Key of ENDPOINTS to fetch
+
+    Returns:
+        dict: Response data, trimmed to FIELDS[endpoint], or None if the
+            endpoint is 'release' and GitHub answered 404
+
+    Raises:
+        urllib.error.URLError: If the request fails (other than a 304, or a
+            404 from the release endpoint)
+    """
+    entry = _load().get(repo, {}).get(endpoint)
+    if _is_fresh(entry, endpoint):
+        return entry['data']
+
+    headers = {'User-Agent': 'nanobot-github-watcher'}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+
+    req = Request(ENDPOINTS[endpoint].format(repo=repo), headers=headers)
+    try:
+        with urlopen(req, timeout=10) as response:
+            data = _trim(endpoint, json.loads(response.read().decode()))
+            etag = response.headers.get('ETag')
+    except HTTPError as e:
+        if e.code == 304 and entry:
+            _store(repo, endpoint, dict(entry, fetched_at=time.time()))
+            return entry['data']
+        if e.code == 404 and endpoint == 'release':
+            # No release published (or no such repo); remember that
+            _store(repo, endpoint, {'data': None, 'etag': None, 'fetched_at': time.time()})
+            return None
+        raise
+
+    _store(repo, endpoint, {'data': data, 'etag': etag, 'fetched_at': time.time()})
+    return data
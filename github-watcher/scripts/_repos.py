@@ -0,0 +1,34 @@
+"""Shared access to the watched repositories list."""
+
+import os
+import functools
+
+# Path to watched repos file
+WATCHED_REPOS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "assets",
+    "watched-repos.txt"
+)
+
+@functools.lru_cache(maxsize=1)
+def load_repos():
+    """Read the watched repos once, in file order.
+
+    Returns:
+        tuple: Repos in owner/repo format (empty if the file is missing)
+    """
+    try:
+        with open(WATCHED_REPOS_FILE, "r") as f:
+            return tuple(line.strip() for line in f if line.strip())
+    except FileNotFoundError:
+        return ()
+
+@functools.lru_cache(maxsize=1)
+def watched():
+    """Return the watched repos as a frozenset for O(1) membership tests."""
+    return frozenset(load_repos())
+
+def invalidate():
+    """Drop the cached list; call after writing WATCHED_REPOS_FILE."""
+    load_repos.cache_clear()
+    watched.cache_clear()
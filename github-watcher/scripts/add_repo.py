@@ -4,12 +4,7 @@
 import os
 import sys
 
-# Path to watched repos file
-WATCHED_REPOS_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)),
-    "assets",
-    "watched-repos.txt"
-)
+from _repos import WATCHED_REPOS_FILE, invalidate, watched
 
 def validate_repo(repo):
     """Validate repo format (owner/repo)."""
@@ -29,24 +24,21 @@ def add_repo(repo):
     if not is_valid:
         return False, error
 
-    # Read existing repos
-    try:
-        with open(WATCHED_REPOS_FILE, "r") as f:
-            repos = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        repos = []
-
     # Check if already exists
-    if repo in repos:
+    if repo in watched():
         return False, f"Repository {repo} is already in the watched list"
 
-    # Add repo
-    repos.append(repo)
-
-    # Write back
+    # Append a single line instead of rewriting the whole file
     os.makedirs(os.path.dirname(WATCHED_REPOS_FILE), exist_ok=True)
-    with open(WATCHED_REPOS_FILE, "w") as f:
-        f.write("\n".join(repos) + "\n")
+    with open(WATCHED_REPOS_FILE, "ab+") as f:
+        line = repo + "\n"
+        # Keep one repo per line if the file lacks a trailing newline
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line
+        f.write(line.encode())
+    invalidate()
 
     return True, f"Added {repo} to watched list"
 
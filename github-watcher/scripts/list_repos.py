@@ -4,78 +4,205 @@
 import os
 import sys
 import json
+import shutil
+import functools
 import subprocess
-from urllib.request import urlopen, Request
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import URLError
 
-# Path to watched repos file
-WATCHED_REPOS_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)),
-    "assets",
-    "watched-repos.txt"
-)
+import _cache
+from _repos import load_repos
+
+GH_REPO_FIELDS = 'stargazerCount,latestRelease,name,owner'
+# Everything the REST release endpoint is cached with, so release_notes.py
+# can be served from the entries a listing leaves behind
+GRAPHQL_RELEASE_FIELDS = 'tagName name description publishedAt author { login }'
+GH_TIMEOUT = 10
+MAX_WORKERS = 16
+
+# Resolved once so hosts without gh skip it instead of failing an exec per call
+_HAS_GH = shutil.which('gh') is not None
+
+@functools.lru_cache(maxsize=1)
+def _gh_env():
+    """Environment for gh subprocesses with the auth token resolved once.
+
+    Exporting GH_TOKEN spares every concurrent `gh` invocation from
+    reading the keyring/config to authenticate on its own.
+    """
+    env = dict(os.environ)
+    if not _HAS_GH or 'GH_TOKEN' in env or 'GITHUB_TOKEN' in env:
+        return env
+    try:
+        result = subprocess.run(
+            ['gh', 'auth', 'token'],
+            capture_output=True,
+            text=True,
+            timeout=GH_TIMEOUT
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return env
+    token = result.stdout.strip()
+    if result.returncode == 0 and token:
+        env['GH_TOKEN'] = token
+    return env
+
+def _parse_gh_repo(stdout):
+    """Build a repo info dict from `gh repo view --json` output."""
+    data = json.loads(stdout)
+    stars = data.get('stargazerCount', 0)
+    release = data.get('latestRelease')
+    if release:
+        version = release.get('tagName', 'N/A')
+    else:
+        version = 'No release'
+    return {
+        'stars': stars,
+        'version': version,
+        'source': 'gh'
+    }
 
 def fetch_gh_cli(repo):
     """Fetch repo info using gh CLI."""
+    if not _HAS_GH:
+        return None
     try:
         # Try to get repo info with stargazer count and latest release
         result = subprocess.run(
-            ['gh', 'repo', 'view', repo, '--json', 'stargazerCount,latestRelease,name,owner'],
+            ['gh', 'repo', 'view', repo, '--json', GH_REPO_FIELDS],
             capture_output=True,
             text=True,
-            timeout=10
+            timeout=GH_TIMEOUT,
+            env=_gh_env()
         )
         if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            stars = data.get('stargazerCount', 0)
-            release = data.get('latestRelease')
-            if release:
-                version = release.get('tagName', 'N/A')
-            else:
-                version = 'No release'
-            return {
-                'stars': stars,
-                'version': version,
-                'source': 'gh'
-            }
-    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError, Exception):
+            return _parse_gh_repo(result.stdout)
+    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
         pass
     return None
 
-def fetch_github_api(repo):
-    """Fetch repo info using GitHub REST API (fallback)."""
-    owner, name = repo.split('/')
+def _build_graphql_query(repos):
+    """Build one GraphQL query aliasing a repository lookup per repo.
+
+    Returns:
+        tuple: (query string, dict of alias -> repo)
+    """
+    aliases = {}
+    fields = []
+    for i, repo in enumerate(repos):
+        parts = repo.split('/')
+        if len(parts) != 2 or not all(parts):
+            continue
+        alias = f"r{i}"
+        aliases[alias] = repo
+        owner, name = (json.dumps(part) for part in parts)
+        fields.append(
+            f"{alias}: repository(owner: {owner}, name: {name}) "
+            "{ stargazerCount latestRelease { " + GRAPHQL_RELEASE_FIELDS + " } }"
+        )
+    return "query { " + " ".join(fields) + " }", aliases
+
+def fetch_gh_graphql(repos):
+    """Fetch info for all repos with a single batched `gh api graphql` call.
 
-    stars = 0
-    version = 'No release'
+    One process spawn and one HTTP round-trip replace a `gh repo view`
+    per repo. Repos GitHub could not resolve are left out of the result.
+
+    Returns:
+        dict: repo -> info for every resolved repo, or None if the call failed
+    """
+    query, aliases = _build_graphql_query(repos)
+    if not _HAS_GH or not aliases:
+        return None
 
     try:
-        # Fetch repo info (includes stargazer count)
-        req = Request(
-            f"https://api.github.com/repos/{owner}/{name}",
-            headers={'User-Agent': 'nanobot-github-watcher'}
-        )
-        with urlopen(req, timeout=10) as response:
-            repo_data = json.loads(response.read().decode())
-            stars = repo_data.get('stargazers_count', 0)
-
-        # Fetch latest release
-        req = Request(
-            f"https://api.github.com/repos/{owner}/{name}/releases/latest",
-            headers={'User-Agent': 'nanobot-github-watcher'}
+        result = subprocess.run(
+            ['gh', 'api', 'graphql', '-f', f'query={query}'],
+            capture_output=True,
+            text=True,
+            timeout=GH_TIMEOUT
         )
-        with urlopen(req, timeout=10) as response:
-            release_data = json.loads(response.read().decode())
-            version = release_data.get('tag_name', 'N/A')
+        # gh exits non-zero when any alias errors (e.g. unknown repo) but
+        # still prints the partial data for the others
+        payload = json.loads(result.stdout) if result.stdout else {}
+    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    data = payload.get('data') if isinstance(payload, dict) else None
+    if not data:
+        return None
+
+    repos_data = {}
+    responses = {}
+    for alias, repo in aliases.items():
+        node = data.get(alias)
+        if not node:
+            continue
+        release = node.get('latestRelease')
+        repos_data[repo] = {
+            'stars': node.get('stargazerCount', 0),
+            'version': release.get('tagName', 'N/A') if release else 'No release',
+            'source': 'gh'
+        }
+        responses[(repo, 'repo')] = {'stargazers_count': node.get('stargazerCount', 0)}
+        responses[(repo, 'release')] = _rest_release(release) if release else None
+
+    # Cache them as if fetched over REST, so the next listing skips the network
+    if responses:
+        _cache.remember(responses)
+    return repos_data
+
+def _rest_release(release):
+    """Convert a GraphQL latestRelease node to the REST release payload shape."""
+    return {
+        'tag_name': release.get('tagName'),
+        'name': release.get('name'),
+        'body': release.get('description'),
+        'published_at': release.get('publishedAt'),
+        'author': release.get('author')
+    }
+
+def _api_get(repo, endpoint):
+    """GET a cached GitHub REST endpoint for a repo, or None on error."""
+    try:
+        return _cache.fetch(repo, endpoint)
     except URLError:
-        version = 'No release'
+        return None
 
+def _parse_api_repo(repo_data, release_data, source='api'):
+    """Build a repo info dict from REST API repo and release payloads."""
+    stars = repo_data.get('stargazers_count', 0) if repo_data else 0
+    version = release_data.get('tag_name', 'N/A') if release_data else 'No release'
     return {
         'stars': stars,
         'version': version,
-        'source': 'api'
+        'source': source
     }
 
+def _cached_info(repo):
+    """Return repo info from the on-disk cache if all of it is fresh."""
+    repo_entry = _cache.lookup(repo, 'repo')
+    release_entry = _cache.lookup(repo, 'release')
+    if repo_entry and release_entry:
+        return _parse_api_repo(repo_entry['data'], release_entry['data'], source='cache')
+    return None
+
+def fetch_github_api(repo):
+    """Fetch repo info using GitHub REST API (fallback)."""
+    # Fetch repo info (includes stargazer count), then latest release
+    repo_data = _api_get(repo, 'repo')
+    release_data = None
+    if repo_data is not None:
+        release_data = _api_get(repo, 'release')
+
+    return _parse_api_repo(repo_data, release_data)
+
+def _with_stars_str(info):
+    """Add the display form of info['stars'] so formatters need no type checks."""
+    stars = info['stars']
+    info['stars_str'] = f"{stars:,}" if isinstance(stars, int) else str(stars)
+    return info
+
 def fetch_repo_info(repo):
     """Fetch repo info with gh CLI fallback to GitHub API."""
     # Try gh CLI first
@@ -84,8 +211,15 @@ def fetch_repo_info(repo):
         return info
 
     # Fall back to GitHub API
-    info = fetch_github_api(repo)
-    return info
+    return fetch_github_api(repo)
+
+def _build_row(repo, data):
+    """Return the (repo, version, stars) cells shared by every formatter."""
+    return repo, data['version'], data['stars_str']
+
+def _build_rows(repos_data):
+    """Yield _build_row() for every repo in repos_data."""
+    return (_build_row(repo, data) for repo, data in repos_data.items())
 
 def format_table_ascii(repos_data):
     """Format repos data as ASCII table (for terminal)."""
@@ -99,70 +233,79 @@ def format_table_ascii(repos_data):
     header = f"{'Repository':<{max_repo}} | {'Version':^15} | {'Stars':>10}"
     separator = "-" * (len(header))
 
-    lines = [header, separator]
-
-    for repo, data in repos_data.items():
-        stars_str = f"{data['stars']:,}" if isinstance(data['stars'], int) else str(data['stars'])
-        lines.append(f"{repo:<{max_repo}} | {data['version']:^15} | {stars_str:>10}")
-
-    return "\n".join(lines)
+    rows = (
+        f"{repo:<{max_repo}} | {version:^15} | {stars_str:>10}"
+        for repo, version, stars_str in _build_rows(repos_data)
+    )
+    return "\n".join((header, separator, *rows))
 
 def format_whatsapp(repos_data):
     """Format repos data for WhatsApp/Telegram with emojis."""
     if not repos_data:
         return "📭 No repositories watched."
 
-    lines = ["📊 *Watched Repositories*\n"]
-
-    for repo, data in repos_data.items():
-        stars_str = f"{data['stars']:,}" if isinstance(data['stars'], int) else str(data['stars'])
-        version = data['version']
-        version_emoji = "🏷️" if version != "No release" and version != "Error" else "❌"
-        lines.append(f"━━━━━━━━━━━━━━━━━")
-        lines.append(f"📁 *{repo}*")
-        lines.append(f"{version_emoji} Version: `{version}`")
-        lines.append(f"⭐ Stars: `{stars_str}`")
-        lines.append("")
-
-    lines.append(f"_Total: {len(repos_data)} repo(s)_")
-    return "\n".join(lines)
+    # One block per repo; joining with "\n" leaves a blank line after each
+    blocks = (
+        f"━━━━━━━━━━━━━━━━━\n"
+        f"📁 *{repo}*\n"
+        f"{'❌' if version in ('No release', 'Error') else '🏷️'} Version: `{version}`\n"
+        f"⭐ Stars: `{stars_str}`\n"
+        for repo, version, stars_str in _build_rows(repos_data)
+    )
+    return "\n".join((
+        "📊 *Watched Repositories*\n",
+        *blocks,
+        f"_Total: {len(repos_data)} repo(s)_"
+    ))
 
 def format_table_markdown(repos_data):
     """Format repos data as Markdown table (for chat)."""
     if not repos_data:
         return "No repositories watched."
 
-    lines = [
+    rows = ("| " + " | ".join(row) + " |" for row in _build_rows(repos_data))
+    return "\n".join((
         "| Repository | Version | Stars |",
-        "|------------|---------|-------|"
-    ]
-
-    for repo, data in repos_data.items():
-        stars_str = f"{data['stars']:,}" if isinstance(data['stars'], int) else str(data['stars'])
-        lines.append(f"| {repo} | {data['version']} | {stars_str} |")
-
-    return "\n".join(lines)
+        "|------------|---------|-------|",
+        *rows
+    ))
 
 def list_repos(format='auto'):
     """List all watched repos with their info."""
-    # Read repos
-    try:
-        with open(WATCHED_REPOS_FILE, "r") as f:
-            repos = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        repos = []
+    repos = load_repos()
 
     if not repos:
         return "No repositories watched. Add one with 'add owner/repo'"
 
-    # Fetch info for each repo
-    repos_data = {}
+    # Serve repos with fresh cache entries without touching the network
+    fetched = {}
     for repo in repos:
-        info = fetch_repo_info(repo)
+        info = _cached_info(repo)
         if info:
-            repos_data[repo] = info
-        else:
-            repos_data[repo] = {'stars': 'N/A', 'version': 'Error', 'source': 'error'}
+            fetched[repo] = info
+
+    # Fetch the rest in one batched GraphQL call
+    pending = [repo for repo in repos if repo not in fetched]
+    if pending:
+        fetched.update(fetch_gh_graphql(pending) or {})
+
+    # Fetch anything the batch missed on a thread pool; the calls are I/O
+    # bound, so wall time is bounded by the slowest repo instead of the sum
+    # of every round-trip
+    missing = [repo for repo in repos if repo not in fetched]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as ex:
+            futures = {repo: ex.submit(fetch_repo_info, repo) for repo in missing}
+            for repo, future in futures.items():
+                # One repo's timeout or bad payload must not abort the listing
+                try:
+                    info = future.result()
+                except Exception:
+                    info = None
+                fetched[repo] = info or {'stars': 'N/A', 'version': 'Error', 'source': 'error'}
+
+    # Pre-format star counts once instead of in every formatter's row loop
+    repos_data = {repo: _with_stars_str(fetched[repo]) for repo in repos}
 
     # Format based on context
     if format == 'auto':
@@ -2,14 +2,29 @@
 """Fetch and summarize the latest release notes for a GitHub repository."""
 
 import os
+import re
 import sys
 import json
+import itertools
+import shutil
 import subprocess
-from urllib.request import urlopen, Request
 from urllib.error import URLError
 
+import _cache
+
+# Resolved once so hosts without gh skip it instead of failing an exec per call
+_HAS_GH = shutil.which('gh') is not None
+
+# A bullet line: *, -, ✓ or ✅ followed by a space, or • with optional space.
+# Whitespace classes exclude \n so a match never spills into the next line.
+_BULLET_RE = re.compile(r'(?m)^[^\S\n]*(?:[*\-✓✅] |•)[^\S\n]*(\S.*?)[^\S\n]*$')
+# Markdown emphasis/code markers stripped from bullet text
+_MARKDOWN_RE = re.compile(r'[*`]+')
+
 def fetch_gh_cli_release(repo):
     """Fetch latest release using gh CLI."""
+    if not _HAS_GH:
+        return None
     try:
         result = subprocess.run(
             ['gh', 'release', 'view', repo, '--json', 'tagName,name,body,publishedAt,author'],
@@ -27,48 +42,40 @@ def fetch_gh_cli_release(repo):
                 'author': data.get('author', {}).get('login', 'Unknown'),
                 'source': 'gh'
             }
-    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError, Exception):
+    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
         pass
     return None
 
 def fetch_github_api_release(repo):
     """Fetch latest release using GitHub REST API (fallback)."""
-    owner, name = repo.split('/')
-
     try:
-        req = Request(
-            f"https://api.github.com/repos/{owner}/{name}/releases/latest",
-            headers={'User-Agent': 'nanobot-github-watcher'}
-        )
-        with urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            return {
-                'tag_name': data.get('tag_name', ''),
-                'name': data.get('name', ''),
-                'body': data.get('body', ''),
-                'published_at': data.get('published_at', ''),
-                'author': data.get('author', {}).get('login', 'Unknown'),
-                'source': 'api'
-            }
-    except URLError as e:
-        if hasattr(e, 'code') and e.code == 404:
-            # Release not found, check if repo exists
-            try:
-                req = Request(
-                    f"https://api.github.com/repos/{owner}/{name}",
-                    headers={'User-Agent': 'nanobot-github-watcher'}
-                )
-                with urlopen(req, timeout=10) as response:
-                    # Repo exists but no releases
-                    return {'error': 'no_releases', 'repo_exists': True}
-            except URLError:
-                # Repo not found
-                return {'error': 'not_found', 'repo': repo}
-        else:
-            return {'error': 'api_error', 'message': str(e)}
+        data = _cache.fetch(repo, 'release')
     except Exception as e:
         return {'error': 'api_error', 'message': str(e)}
 
+    if data is None:
+        # GitHub answers "Not Found" both for a missing repo and for a
+        # repo without releases, so only probe the repo if the cache has
+        # never seen it
+        if _cache.known(repo, 'repo'):
+            return {'error': 'no_releases', 'repo_exists': True}
+        try:
+            _cache.fetch(repo, 'repo')
+            # Repo exists but no releases
+            return {'error': 'no_releases', 'repo_exists': True}
+        except URLError:
+            # Repo not found
+            return {'error': 'not_found', 'repo': repo}
+
+    return {
+        'tag_name': data.get('tag_name', ''),
+        'name': data.get('name', ''),
+        'body': data.get('body', ''),
+        'published_at': data.get('published_at', ''),
+        'author': data.get('author', {}).get('login', 'Unknown'),
+        'source': 'api'
+    }
+
 def fetch_latest_release(repo):
     """Fetch latest release with gh CLI fallback to GitHub API."""
     # Validate repo format
@@ -86,44 +93,16 @@ def fetch_latest_release(repo):
 
 def summarize_release(body, repo):
     """Extract bullet points from release notes to create a quick summary."""
-    try:
-        # Split body into lines
-        lines = body.strip().split('\n')
-        bullet_points = []
-
-        # Look for bullet points (various formats)
-        bullet_prefixes = ['* ', '- ', '• ', '•', '✓ ', '✅ ', '- ']
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check if this is a bullet point
-            for prefix in bullet_prefixes:
-                if line.startswith(prefix):
-                    # Remove the prefix and clean up
-                    point = line[len(prefix):].strip()
-                    # Remove markdown formatting
-                    point = point.replace('**', '').replace('*', '').replace('`', '')
-                    # Limit length
-                    if len(point) > 80:
-                        point = point[:77] + '...'
-                    if point:
-                        bullet_points.append(point)
-                    break
-
-            # Stop if we have enough points
-            if len(bullet_points) >= 8:
-                break
-
-        # If we found bullet points, format them
-        if bullet_points:
-            return '\n'.join([f'• {point}' for point in bullet_points[:8]])
-
-    except Exception:
-        pass
+    # Scan the whole body in one pass, stopping once enough points are found
+    points = (_MARKDOWN_RE.sub('', match.group(1)) for match in _BULLET_RE.finditer(body))
+    bullet_points = [
+        point[:77] + '...' if len(point) > 80 else point
+        for point in itertools.islice(filter(None, points), 8)
+    ]
 
+    # If we found bullet points, format them
+    if bullet_points:
+        return '\n'.join(f'• {point}' for point in bullet_points)
     return None
 
 def format_whatsapp_release(repo, release):
@@ -158,25 +137,22 @@ def format_whatsapp_release(repo, release):
         f"━━━━━━━━━━━━━━━━━",
     ]
 
+    # Truncate very long bodies first so summarizing only scans what is shown
+    max_body_length = 2000
+    truncated = len(body) > max_body_length
+    body = body[:max_body_length]
+
     # Try to get summary
     summary = summarize_release(body, repo)
     if summary:
-        lines.append(f"📋 *Summary:*")
-        lines.append(summary)
-        lines.append("")
-        lines.append(f"🔗 *Full notes:*")
+        lines += (f"📋 *Summary:*", summary, "", f"🔗 *Full notes:*")
     else:
         lines.append("")
 
-    # Add body (truncated if very long)
-    max_body_length = 2000
-    if len(body) > max_body_length:
-        body = body[:max_body_length] + "\n\n...(truncated, visit GitHub for full notes)"
+    if truncated:
+        body += "\n\n...(truncated, visit GitHub for full notes)"
 
-    lines.append(body)
-
-    lines.append("")
-    lines.append(f"🔗 *View on GitHub:* https://github.com/{repo}/releases/tag/{tag_name}")
+    lines += (body, "", f"🔗 *View on GitHub:* https://github.com/{repo}/releases/tag/{tag_name}")
 
     return "\n".join(lines)
 
@@ -214,13 +190,9 @@ def format_terminal_release(repo, release):
     # Try to get summary
     summary = summarize_release(body, repo)
     if summary:
-        lines.append(f"Summary:")
-        lines.append(summary)
-        lines.append("")
+        lines += (f"Summary:", summary, "")
 
-    lines.append(body)
-    lines.append("")
-    lines.append(f"URL: https://github.com/{repo}/releases/tag/{tag_name}")
+    lines += (body, "", f"URL: https://github.com/{repo}/releases/tag/{tag_name}")
 
     return "\n".join(lines)
 
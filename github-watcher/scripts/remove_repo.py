@@ -4,30 +4,23 @@
 import os
 import sys
 
-# Path to watched repos file
-WATCHED_REPOS_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)),
-    "assets",
-    "watched-repos.txt"
-)
+from _repos import WATCHED_REPOS_FILE, invalidate, load_repos
 
 def remove_repo(repo):
     """Remove a repo from the watched list."""
-    try:
-        with open(WATCHED_REPOS_FILE, "r") as f:
-            repos = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
+    if not os.path.exists(WATCHED_REPOS_FILE):
         return False, f"Watched list not found"
+    repos = load_repos()
 
-    if repo not in repos:
+    # Remove repo in a single pass; nothing to rewrite if it was absent
+    remaining = [r for r in repos if r != repo]
+    if len(remaining) == len(repos):
         return False, f"Repository {repo} not found in watched list"
 
-    # Remove repo
-    repos.remove(repo)
-
     # Write back
     with open(WATCHED_REPOS_FILE, "w") as f:
-        f.write("\n".join(repos) + "\n")
+        f.write("\n".join(remaining) + "\n")
+    invalidate()
 
     return True, f"Removed {repo} from watched list"
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for github-watcher list_repos.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+# Scripts import their helpers as top-level modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import _cache
+import list_repos
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    """Point the cache at an empty file and forget anything loaded."""
+    path = tmp_path / "cache.json"
+    monkeypatch.setattr(_cache, 'CACHE_FILE', str(path))
+    monkeypatch.setattr(_cache, '_entries', None)
+    return path
+
+
+@pytest.fixture
+def no_rest(monkeypatch):
+    """Fail the test on any REST request."""
+    def urlopen(req, timeout=None):
+        raise AssertionError(f"unexpected request: {req.full_url}")
+    monkeypatch.setattr(_cache, 'urlopen', urlopen)
+
+
+class TestListRepos:
+    """Test the list_repos function."""
+
+    def test_failed_repo_gets_error_row(self, monkeypatch):
+        """Test one repo raising does not abort the whole listing."""
+        def fetch_repo_info(repo):
+            if repo == 'owner/slow':
+                raise TimeoutError('timed out')
+            return {'stars': 42, 'version': 'v1.0', 'source': 'api'}
+
+        monkeypatch.setattr(list_repos, 'load_repos', lambda: ['owner/slow', 'owner/fast'])
+        monkeypatch.setattr(list_repos, '_cached_info', lambda repo: None)
+        monkeypatch.setattr(list_repos, 'fetch_gh_graphql', lambda repos: None)
+        monkeypatch.setattr(list_repos, 'fetch_repo_info', fetch_repo_info)
+
+        table = list_repos.list_repos(format='markdown')
+
+        assert '| owner/slow | Error | N/A |' in table
+        assert '| owner/fast | v1.0 | 42 |' in table
+
+    def test_warm_listing_skips_network(self, cache_file, no_rest, monkeypatch):
+        """Test a second listing is served from what the GraphQL call cached."""
+        payload = {'data': {
+            'r0': {'stargazerCount': 1234, 'latestRelease': {
+                'tagName': 'v2.0', 'name': 'Two', 'description': 'Notes',
+                'publishedAt': '2026-01-01T00:00:00Z', 'author': {'login': 'octocat'}
+            }},
+            'r1': {'stargazerCount': 7, 'latestRelease': None},
+        }}
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(payload), stderr='')
+
+        monkeypatch.setattr(list_repos, '_HAS_GH', True)
+        monkeypatch.setattr(list_repos.subprocess, 'run', run)
+        monkeypatch.setattr(list_repos, 'load_repos', lambda: ['owner/one', 'owner/two'])
+
+        cold = list_repos.list_repos(format='markdown')
+        # A new process starts from the file, not the in-memory copy
+        monkeypatch.setattr(_cache, '_entries', None)
+        warm = list_repos.list_repos(format='markdown')
+
+        assert len(calls) == 1
+        assert warm == cold
+        assert '| owner/one | v2.0 | 1,234 |' in warm
+        assert '| owner/two | No release | 7 |' in warm
+        assert _cache.lookup('owner/one', 'release')['data']['body'] == 'Notes'
+
+
+class TestCache:
+    """Test the shared REST response cache."""
+
+    def test_release_404_is_cached(self, cache_file, monkeypatch):
+        """Test a repo without releases is not asked again while fresh."""
+        requests = []
+
+        def urlopen(req, timeout=None):
+            requests.append(req.full_url)
+            raise HTTPError(req.full_url, 404, 'Not Found', {}, None)
+
+        monkeypatch.setattr(_cache, 'urlopen', urlopen)
+
+        assert _cache.fetch('owner/repo', 'release') is None
+        assert _cache.fetch('owner/repo', 'release') is None
+        assert len(requests) == 1
+
+    def test_repo_404_still_raises(self, cache_file, monkeypatch):
+        """Test only the release endpoint treats a 404 as an answer."""
+        def urlopen(req, timeout=None):
+            raise HTTPError(req.full_url, 404, 'Not Found', {}, None)
+
+        monkeypatch.setattr(_cache, 'urlopen', urlopen)
+
+        with pytest.raises(HTTPError):
+            _cache.fetch('owner/repo', 'repo')
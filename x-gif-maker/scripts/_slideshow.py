@@ -0,0 +1,72 @@
+"""Frame helpers shared by create_slideshow.py and create_slideshow_fast.py."""
+
+from PIL import Image
+import numpy as np
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def _ink_pieces(layer: Image.Image) -> List[tuple]:
+    """
+    Split an RGBA layer into (colors, alpha, offset) pieces, one per band of
+    rows with ink, cropped to that ink. Frames then composite only those
+    pieces (about a tenth of a headline layer) rather than the whole canvas.
+    """
+    colors = layer.convert('RGB')
+    alpha = layer.getchannel('A')
+    pieces = []
+    top = 0
+    for inked, rows in groupby(np.asarray(alpha).any(axis=1).tolist()):
+        bottom = top + sum(1 for _ in rows)
+        if inked:
+            left, _, right, _ = alpha.crop((0, top, layer.width, bottom)).getbbox()
+            box = (left, top, right, bottom)
+            pieces.append((colors.crop(box), alpha.crop(box), (left, top)))
+        top = bottom
+    return pieces
+
+
+# Frame renderer and shared palette of a pool worker, set by _init_frame_worker()
+_worker_render = None
+_worker_palette = None
+
+
+def _init_frame_worker(maker_cls: type, maker_args: Dict[str, Any], render_args: Dict[str, Any],
+                       palette: Optional[Image.Image]):
+    """Pool initializer: redo the per-slideshow setup once per worker."""
+    global _worker_render, _worker_palette
+    _worker_render, _, _ = maker_cls(**maker_args)._build_frame_renderer(**render_args)
+    _worker_palette = palette
+
+
+def _render_frame_worker(i: int) -> Image.Image:
+    """Render one distinct frame in a pool worker."""
+    frame = _worker_render(i)
+    if _worker_palette is not None:
+        frame = _to_palette(frame, _worker_palette)
+    return frame
+
+
+def _to_palette(frame: Image.Image, palette: Image.Image) -> Image.Image:
+    """Convert an RGB frame to palette mode with the slideshow's shared palette."""
+    # No dithering: it would make the static background flicker between frames
+    return frame.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def _write_mp4(frames: Iterator[Image.Image], repeats: List[int], output_path: str,
+               size: Tuple[int, int], fps: float) -> Iterator[Image.Image]:
+    """
+    Pass frames through, piping each into an MP4 as it goes by, shown
+    for the matching number of repeats (video frames have a fixed rate).
+    Requires ffmpeg: pip install imageio-ffmpeg, or an ffmpeg binary on PATH
+    """
+    # Same encoder as create_gif.py; imported here so GIF-only runs skip it
+    from create_gif import _ffmpeg_writer
+
+    width, height = size
+    with _ffmpeg_writer(output_path, width, height, fps, 'libx264', '2M') as write:
+        for frame, count in zip(frames, repeats):
+            data = frame.tobytes()
+            for _ in range(count):
+                write(data)
+            yield frame
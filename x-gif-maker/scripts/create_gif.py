@@ -4,15 +4,61 @@ X GIF Maker - Create animated GIFs/MP4s for social media posts.
 Supports 11+ animation styles, auto-upload, and customizable appearance.
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+import numpy as np
 import textwrap
 import json
 import random
-from typing import List, Dict, Any, Optional
+import multiprocessing
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Iterator
 import os
 import requests
 
 
+# Fonts tried in order by GifMaker._load_font()
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+]
+
+# gifsicle optimizes GIFs better and faster than Pillow's optimize=True;
+# resolved once, Pillow's optimizer is the fallback when it is missing
+GIFSICLE = shutil.which("gifsicle")
+
+CATBOX_URL = "https://catbox.moe/user/api.php"
+
+# Concurrent uploads in GifMaker.upload_many(); uploads are network bound
+UPLOAD_WORKERS = 8
+
+# Order of the values returned by GifMaker._get_animation_params()
+ANIMATION_PARAMS = ('alpha', 'offset_y', 'offset_x', 'scale', 'glow_intensity', 'glitch_amount')
+
+
+@lru_cache(maxsize=16)
+def _truetype(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Parse a font file once per (path, size); fonts are read-only once loaded."""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=16)
+def _default_font(size: int) -> ImageFont.FreeTypeFont:
+    """First available FONT_PATHS font at size, or PIL's default (memoized)."""
+    for path in FONT_PATHS:
+        try:
+            return _truetype(path, size)
+        except (OSError, ImportError):
+            continue
+
+    # Fallback to default
+    return ImageFont.load_default()
+
+
 class GifMaker:
     def __init__(
         self,
@@ -20,83 +66,94 @@ class GifMaker:
         height: int = 360,
         fps: int = 30,
         duration: int = 2,
-        font_size: int = 36
+        font_size: int = 36,
+        workers: int = 1
     ):
         self.width = width
         self.height = height
         self.fps = fps
+        self.duration = duration
         self.total_frames = fps * duration
         self.font_size = font_size
+        self.workers = workers  # Frame-rendering processes (0 = one per CPU)
         self.font = None
         self.sig_font = None
-        self.frames_cache = None  # Cache frames for MP4 export
+        self.frames_cache = None  # (frames, height, width, 3) uint8 array for MP4 export
+        self._session = requests.Session()  # Keep-alive connection reused by uploads
+        self._logo_cache = {}  # (logo_path, size) -> resized RGBA logo, or None if unloadable
+
+    def _init_args(self) -> Dict[str, Any]:
+        """Constructor arguments for an equivalent GifMaker in a worker process."""
+        return {
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'duration': self.duration,
+            'font_size': self.font_size,
+        }
 
     def _load_font(self, size: int = None) -> ImageFont.FreeTypeFont:
         """Load font, falling back to default if not found."""
-        size = size or self.font_size
-        font_paths = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-            "/System/Library/Fonts/Helvetica.ttc",
-        ]
-
-        for path in font_paths:
-            try:
-                return ImageFont.truetype(path, size)
-            except:
-                continue
-
-        # Fallback to default
-        return ImageFont.load_default()
+        return _default_font(size or self.font_size)
 
     def create_gradient_background(self, colors: List[str]) -> Image.Image:
         """Create a gradient background from color list."""
-        img = Image.new('RGB', (self.width, self.height), colors[0])
-        draw = ImageDraw.Draw(img)
-
         if len(colors) == 1:
-            return img
-
-        # Create gradient
-        for y in range(self.height):
-            ratio = y / self.height
-
-            # Handle 2-color or 3-color gradient
-            if len(colors) == 2:
-                c1 = self._hex_to_rgb(colors[0])
-                c2 = self._hex_to_rgb(colors[1])
-                color = tuple(int(c1[i] + (c2[i] - c1[i]) * ratio) for i in range(3))
-            else:
-                # 3-color gradient
-                if ratio < 0.5:
-                    r = ratio * 2
-                    c1 = self._hex_to_rgb(colors[0])
-                    c2 = self._hex_to_rgb(colors[1])
-                else:
-                    r = (ratio - 0.5) * 2
-                    c1 = self._hex_to_rgb(colors[1])
-                    c2 = self._hex_to_rgb(colors[2])
-                color = tuple(int(c1[i] + (c2[i] - c1[i]) * r) for i in range(3))
-
-            draw.line([(0, y), (self.width, y)], fill=color)
-
-        return img
-
-    def _hex_to_rgb(self, hex_color: str) -> tuple:
-        """Convert hex color to RGB tuple."""
+            return Image.new('RGB', (self.width, self.height), colors[0])
+
+        # Per-row interpolation ratio, broadcast across the width below
+        ratio = np.arange(self.height) / self.height
+
+        # Handle 2-color or 3-color gradient
+        if len(colors) == 2:
+            c1 = np.array(self._hex_to_rgb(colors[0]), dtype=np.float64)
+            c2 = np.array(self._hex_to_rgb(colors[1]), dtype=np.float64)
+            rows = c1 + (c2 - c1) * ratio[:, None]
+        else:
+            # 3-color gradient: first half blends 0->1, second half 1->2
+            c0, c1, c2 = (np.array(self._hex_to_rgb(c), dtype=np.float64) for c in colors[:3])
+            first = ratio < 0.5
+            r = np.where(first, ratio * 2, (ratio - 0.5) * 2)[:, None]
+            start = np.where(first[:, None], c0, c1)
+            end = np.where(first[:, None], c1, c2)
+            rows = start + (end - start) * r
+
+        # Truncate like int() did per row; stretching the 1px-wide column is
+        # a C-level row fill, cheaper than materializing HxWx3 in NumPy
+        column = Image.fromarray(rows.astype(np.uint8)[:, None, :], 'RGB')
+        return column.resize((self.width, self.height), Image.Resampling.NEAREST)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _hex_to_rgb(hex_color: str) -> tuple:
+        """Convert hex color to RGB tuple (memoized; callers reuse a few colors)."""
         hex_color = hex_color.lstrip('#')
         if len(hex_color) == 3:
             hex_color = ''.join(c * 2 for c in hex_color)
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+    @staticmethod
+    def _text_sprite(text: str, font: ImageFont.FreeTypeFont) -> tuple:
+        """
+        Rasterize text once as an 'L' coverage mask. Returns (mask, (dx, dy)),
+        the offset from the "mm" anchor point to the mask's top-left corner.
+        Pasting a color through the mask at an integer anchor matches
+        draw.text() there, without rasterizing the glyphs again.
+        """
+        left, top, right, bottom = font.getbbox(text, anchor="mm")
+        mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255, anchor="mm")
+        return mask, (left, top)
+
     def wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
         """Wrap text to fit within max_width."""
+        # Approximate characters per line from half the width of an 'M'
+        max_chars = max(1, max_width // (font.getbbox('M')[2] // 2))
         lines = []
         for line in text.split('\n'):
             if not line.strip():
                 continue
-            wrapped = textwrap.wrap(line, width=max_width // (font.getbbox('M')[2] // 2))
-            lines.extend(wrapped)
+            lines.extend(textwrap.wrap(line, width=max_chars))
         return lines
 
     def _apply_logo(
@@ -107,27 +164,34 @@ class GifMaker:
         size: int = 50
     ):
         """Apply logo watermark to image."""
-        try:
-            logo = Image.open(logo_path).convert("RGBA")
-            logo = logo.resize((size, size), Image.Resampling.LANCZOS)
-
-            x, y = 0, 0
-            padding = 15
-
-            if position == "top-left":
-                x, y = padding, padding
-            elif position == "top-right":
-                x, y = self.width - size - padding, padding
-            elif position == "bottom-left":
-                x, y = padding, self.height - size - padding
-            elif position == "bottom-right":
-                x, y = self.width - size - padding, self.height - size - padding
-            elif position == "center":
-                x, y = (self.width - size) // 2, (self.height - size) // 2
-
-            img.paste(logo, (x, y), logo)
-        except Exception as e:
-            print(f"⚠️  Could not apply logo: {e}")
+        # Decode and resize the logo once, not on every frame
+        key = (logo_path, size)
+        if key not in self._logo_cache:
+            try:
+                logo = Image.open(logo_path).convert("RGBA")
+                self._logo_cache[key] = logo.resize((size, size), Image.Resampling.LANCZOS)
+            except Exception as e:
+                print(f"⚠️  Could not apply logo: {e}")
+                self._logo_cache[key] = None
+        logo = self._logo_cache[key]
+        if logo is None:
+            return
+
+        x, y = 0, 0
+        padding = 15
+
+        if position == "top-left":
+            x, y = padding, padding
+        elif position == "top-right":
+            x, y = self.width - size - padding, padding
+        elif position == "bottom-left":
+            x, y = padding, self.height - size - padding
+        elif position == "bottom-right":
+            x, y = self.width - size - padding, self.height - size - padding
+        elif position == "center":
+            x, y = (self.width - size) // 2, (self.height - size) // 2
+
+        img.paste(logo, (x, y), logo)
 
     def create_text_gif(
         self,
@@ -140,11 +204,99 @@ class GifMaker:
         logo_path: str = None,
         logo_position: str = "bottom-right",
         font_path: str = None,
-        quality: int = 85
+        quality: int = 85,
+        cache_frames: bool = True,
+        mp4_path: Optional[str] = None,
+        codec: str = "libx264",
+        bitrate: str = "2M"
     ):
-        """Create an animated text GIF with specified style."""
-        frames = []
+        """
+        Create an animated text GIF with specified style.
+        Frames are kept in frames_cache for export_mp4() unless cache_frames
+        is False, in which case each one is streamed into the encoder.
+        With mp4_path, frames are also piped to ffmpeg as they are rendered,
+        so the MP4 needs neither the cache nor a second pass.
+        """
+        render_args = {
+            'text': text,
+            'style': style,
+            'bg_colors': bg_colors,
+            'text_color': text_color,
+            'signature': signature,
+            'logo_path': logo_path,
+            'logo_position': logo_position,
+            'font_path': font_path,
+        }
+
+        self.frames_cache = None
+        if cache_frames:
+            frames_arr = np.empty((self.total_frames, self.height, self.width, 3), dtype=np.uint8)
+
+        # Frames kept for export_mp4() or fed to ffmpeg must reach us as RGB,
+        # not palettized
+        with ExitStack() as stack:
+            frames = stack.enter_context(
+                self._render_frames(render_args, quantize=not (cache_frames or mp4_path))
+            )
+            if cache_frames:
+                frames = _copy_into(frames, frames_arr)
+            if mp4_path:
+                write = stack.enter_context(
+                    _ffmpeg_writer(mp4_path, self.width, self.height, self.fps, codec, bitrate)
+                )
+                frames = _pipe_frames(frames, write)
+            first_frame = next(frames)
+
+            # Save as GIF
+            save_opts = {
+                'save_all': True,
+                'append_images': frames,
+                'duration': 1000 // self.fps,
+                'loop': 0,
+                'disposal': 2,
+            }
+
+            # Pillow optimizes unless told not to; leave that to gifsicle
+            use_gifsicle = quality < 100 and GIFSICLE is not None
+            if quality < 100:
+                save_opts['optimize'] = not use_gifsicle
+
+            first_frame.save(output_path, **save_opts)
 
+        if use_gifsicle and not _gifsicle_optimize(output_path, quality):
+            print("⚠️  gifsicle failed; GIF left unoptimized")
+
+        if cache_frames:
+            self.frames_cache = frames_arr
+
+        file_size = os.path.getsize(output_path) / 1024
+        print(f"✅ GIF saved to: {output_path}")
+        print(f"   Size: {self.total_frames} frames, {self.width}x{self.height}")
+        print(f"   File: {file_size:.1f} KB")
+
+        if mp4_path:
+            file_size = os.path.getsize(mp4_path) / 1024
+            print(f"✅ MP4 saved to: {mp4_path}")
+            print(f"   File: {file_size:.1f} KB")
+
+    def _build_frame_renderer(
+        self,
+        text: str,
+        style: str,
+        bg_colors: List[str],
+        text_color: str,
+        signature: Optional[str],
+        logo_path: Optional[str],
+        logo_position: str,
+        font_path: Optional[str],
+        reuse_buffer: bool = False
+    ) -> Callable[[int], Image.Image]:
+        """
+        Do the per-animation setup and return a function rendering frame N.
+        Frames only depend on their index, so they can be rendered in any order.
+        With reuse_buffer, every frame is drawn into the same image, so each
+        one must be consumed before the next is rendered.
+        """
         # Load fonts
         self.font = self._load_font(self.font_size) if not font_path else self._load_font_custom(font_path, self.font_size)
         self.sig_font = self._load_font(16)
@@ -157,15 +309,63 @@ class GifMaker:
         total_height = len(lines) * line_height
         y_offset = (self.height - total_height) // 2
 
-        for frame_num in range(self.total_frames):
-            progress = frame_num / self.total_frames
-
-            # Create background
-            bg = self.create_gradient_background(bg_colors)
-            draw = ImageDraw.Draw(bg)
+        # The background and text color are the same for every frame
+        background = self.create_gradient_background(bg_colors)
+        text_rgb = self._hex_to_rgb(text_color)
+
+        # Animation parameters for every frame, as plain Python tuples
+        schedule = self._build_animation_schedule(style, self.total_frames)
+        if schedule is not None:
+            frame_params = list(zip(*(schedule[name].tolist() for name in ANIMATION_PARAMS)))
+
+        if reuse_buffer:
+            work_img = background.copy()
+            work_draw = ImageDraw.Draw(work_img)
+
+        # Every line is rasterized once; frames paste the inks through these
+        line_sprites = [self._text_sprite(line, self.font) for line in lines]
+        sig_sprite = self._text_sprite(signature, self.sig_font) if signature else None
+
+        # Glow masks per text offset; glowing styles keep the text still,
+        # so the mask is normally rasterized only once per animation
+        glow_masks = {}
+
+        def text_mask(offset_x: int, offset_y: int) -> Image.Image:
+            key = (offset_x, offset_y)
+            if key not in glow_masks:
+                mask = Image.new('L', (self.width, self.height), 0)
+                mask_draw = ImageDraw.Draw(mask)
+                for i, line in enumerate(lines):
+                    xy = (self.width // 2 + offset_x, y_offset + i * line_height + offset_y)
+                    mask_draw.text(xy, line, font=self.font, fill=255, anchor="mm")
+                glow_masks[key] = mask
+            return glow_masks[key]
+
+        def render_frame(frame_num: int) -> Image.Image:
+            # Reset or copy background
+            if reuse_buffer:
+                bg = work_img
+                bg.paste(background, (0, 0))
+                draw = work_draw
+            else:
+                bg = background.copy()
+                draw = ImageDraw.Draw(bg)
 
             # Get animation parameters
-            alpha, offset_y, offset_x, scale, glow_intensity, glitch_amount = self._get_animation_params(style, progress)
+            if schedule is not None:
+                params = frame_params[frame_num]
+            else:
+                params = self._get_animation_params(style, frame_num / self.total_frames)
+            alpha, offset_y, offset_x, scale, glow_intensity, glitch_amount = params
+
+            # Apply glow effect beneath the text
+            if glow_intensity > 0:
+                self._apply_glow(bg, text_color, glow_intensity, text_mask(offset_x, offset_y))
+
+            # Paste takes its opacity from the mask, not from a fill color's
+            # alpha: scale sprite masks by these for translucent ink
+            text_fade = [int(v * alpha) for v in range(256)]
+            shadow_fade = [int(v * alpha * 100 / 255) for v in range(256)]
 
             # Draw each line
             for i, line in enumerate(lines):
@@ -182,98 +382,72 @@ class GifMaker:
                         draw, line, text_x, text_y,
                         self.font, text_color, scale, alpha
                     )
-                else:
-                    # Draw with offset
-                    if alpha < 1.0:
-                        # Fade effect using alpha
-                        rgb = self._hex_to_rgb(text_color)
-                        rgba = rgb + (int(alpha * 255),)
-
-                        # Simple shadow for visibility
-                        shadow_alpha = int(alpha * 100)
-                        shadow_rgba = (0, 0, 0, shadow_alpha)
-                        draw.text((text_x + 2, text_y + 2), line, font=self.font, fill=shadow_rgba, anchor="mm")
-
-                        draw.text((text_x, text_y), line, font=self.font, fill=rgba, anchor="mm")
-                    else:
-                        # Draw shadow
-                        draw.text((text_x + 2, text_y + 2), line, font=self.font, fill=(0, 0, 0, 100), anchor="mm")
-                        draw.text((text_x, text_y), line, font=self.font, fill=text_color, anchor="mm")
+                    continue
+
+                # Simple translucent shadow for visibility, then the text
+                # faded in with alpha, pasted through the line's sprite
+                mask, (dx, dy) = line_sprites[i]
+                bg.paste((0, 0, 0), (text_x + 2 + dx, text_y + 2 + dy), mask.point(shadow_fade))
+                if alpha < 1.0:
+                    mask = mask.point(text_fade)
+                bg.paste(text_rgb, (text_x + dx, text_y + dy), mask)
 
             # Apply glitch effect
             if glitch_amount > 0:
                 self._apply_glitch(bg, glitch_amount)
 
-            # Apply glow effect
-            if glow_intensity > 0:
-                self._apply_glow(bg, text_color, glow_intensity)
-
             # Draw signature if provided
             if signature:
-                sig_alpha = int(alpha * 200)
-                sig_rgba = (255, 255, 255, sig_alpha)
-                draw.text(
-                    (self.width // 2, self.height - 30),
-                    signature,
-                    font=self.sig_font,
-                    fill=sig_rgba,
-                    anchor="mm"
-                )
+                sig_fade = [int(v * alpha * 200 / 255) for v in range(256)]
+                mask, (dx, dy) = sig_sprite
+                bg.paste((255, 255, 255), (self.width // 2 + dx, self.height - 30 + dy), mask.point(sig_fade))
 
             # Apply logo
             if logo_path:
                 self._apply_logo(bg, logo_path, logo_position)
 
-            frames.append(bg)
+            return bg
 
-        # Save as GIF
-        save_opts = {
-            'save_all': True,
-            'append_images': frames[1:],
-            'duration': 1000 // self.fps,
-            'loop': 0,
-            'disposal': 2,
-        }
-
-        if quality < 100:
-            save_opts['optimize'] = True
+        return render_frame
 
-        frames[0].save(output_path, **save_opts)
-
-        # Cache frames for potential MP4 export
-        self.frames_cache = frames
+    @contextmanager
+    def _render_frames(self, render_args: Dict[str, Any], quantize: bool = False) -> Iterator[Iterator[Image.Image]]:
+        """
+        Yield an iterator over all frames, in order.
+        Each frame must be consumed (e.g. copied by the GIF encoder) before the
+        next is requested, as serial rendering reuses one buffer. With more
+        than one worker, frames are rendered by a process pool and, if quantize
+        is set, converted to palette mode there too (the GIF encoder's most
+        expensive step) instead of serially in the encoder.
+        """
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1:
+            render = self._build_frame_renderer(**render_args, reuse_buffer=True)
+            yield map(render, range(self.total_frames))
+            return
 
-        file_size = os.path.getsize(output_path) / 1024
-        print(f"✅ GIF saved to: {output_path}")
-        print(f"   Size: {len(frames)} frames, {self.width}x{self.height}")
-        print(f"   File: {file_size:.1f} KB")
+        initargs = (self._init_args(), render_args, quantize)
+        with multiprocessing.Pool(workers, initializer=_init_frame_worker, initargs=initargs) as pool:
+            chunksize = max(1, self.total_frames // (workers * 4))
+            yield pool.imap(_render_frame_worker, range(self.total_frames), chunksize)
 
     def export_mp4(self, output_path: str, codec: str = "libx264", bitrate: str = "2M"):
         """
         Export cached frames as MP4 video.
-        Requires: pip install imageio imageio-ffmpeg or pip install moviepy
+        Prefer create_text_gif(mp4_path=...), which needs no frame cache.
+        Requires ffmpeg: pip install imageio-ffmpeg, or an ffmpeg binary on PATH
         """
         if self.frames_cache is None:
-            raise RuntimeError("No frames cached. Call create_text_gif() first.")
+            raise RuntimeError("No frames cached. Call create_text_gif() with cache_frames=True first.")
 
-        try:
-            import imageio
-        except ImportError:
-            raise ImportError("imageio not installed. Run: pip install imageio imageio-ffmpeg")
-
-        # Convert PIL images to numpy arrays
-        import numpy as np
-        frames_np = [np.array(frame) for frame in self.frames_cache]
-
-        # Write MP4
-        writer = imageio.get_writer(output_path, fps=self.fps, codec=codec, bitrate=bitrate)
-        for frame in frames_np:
-            writer.append_data(frame)
-        writer.close()
+        # Pipe the cached frame array straight into ffmpeg
+        with _ffmpeg_writer(output_path, self.width, self.height, self.fps, codec, bitrate) as write:
+            for frame in self.frames_cache:
+                write(frame)
 
         file_size = os.path.getsize(output_path) / 1024
         print(f"✅ MP4 saved to: {output_path}")
-        print(f"   Size: {len(frames_np)} frames, {self.width}x{self.height}")
+        print(f"   Size: {len(self.frames_cache)} frames, {self.width}x{self.height}")
         print(f"   File: {file_size:.1f} KB")
 
     def upload_to_catbox(self, file_path: str) -> Optional[str]:
@@ -283,11 +457,10 @@ class GifMaker:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        url = "https://catbox.moe/user/api.php"
         try:
             with open(file_path, 'rb') as f:
                 files = {'fileToUpload': (os.path.basename(file_path), f)}
-                response = requests.post(url, files=files, timeout=30)
+                response = self._session.post(CATBOX_URL, files=files, timeout=30)
 
             if response.status_code == 200:
                 return response.text.strip()
@@ -296,6 +469,22 @@ class GifMaker:
         except Exception as e:
             raise Exception(f"Upload error: {e}")
 
+    def upload_many(self, file_paths: List[str]) -> List[Any]:
+        """
+        Upload files to catbox.moe concurrently over the shared session.
+        Returns, in order, each file's URL or the exception its upload raised.
+        """
+        def upload(file_path):
+            try:
+                return self.upload_to_catbox(file_path)
+            except Exception as e:
+                return e
+
+        if not file_paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(file_paths))) as ex:
+            return list(ex.map(upload, file_paths))
+
     def create_and_upload(
         self,
         text: str,
@@ -316,8 +505,10 @@ class GifMaker:
             'mp4_url': None
         }
 
-        # Create GIF
-        self.create_text_gif(text=text, output_path=output_path, style=style, **kwargs)
+        # Create GIF, encoding the MP4 alongside it if requested
+        mp4_path = output_path.rsplit('.', 1)[0] + '.mp4' if export_mp4 else None
+        kwargs.setdefault('cache_frames', False)
+        self.create_text_gif(text=text, output_path=output_path, style=style, mp4_path=mp4_path, **kwargs)
 
         # Upload GIF if requested
         if upload:
@@ -327,13 +518,10 @@ class GifMaker:
             except Exception as e:
                 print(f"⚠️  GIF upload failed: {e}")
 
-        # Export MP4 if requested
+        # Upload MP4 if requested
         if export_mp4:
-            mp4_path = output_path.rsplit('.', 1)[0] + '.mp4'
-            self.export_mp4(mp4_path)
             results['mp4_path'] = mp4_path
 
-            # Upload MP4 if requested
             if upload:
                 try:
                     results['mp4_url'] = self.upload_to_catbox(mp4_path)
@@ -346,8 +534,8 @@ class GifMaker:
     def _load_font_custom(self, font_path: str, size: int) -> ImageFont.FreeTypeFont:
         """Load custom font from path."""
         try:
-            return ImageFont.truetype(font_path, size)
-        except:
+            return _truetype(font_path, size)
+        except (OSError, ImportError):
             return self._load_font(size)
 
     def _get_animation_params(self, style: str, progress: float) -> tuple:
@@ -410,68 +598,135 @@ class GifMaker:
 
         return alpha, offset_y, offset_x, scale, glow_intensity, glitch_amount
 
+    def _build_animation_schedule(self, style: str, total_frames: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Vectorized _get_animation_params() for every frame of an animation.
+        Returns a dict of per-frame arrays keyed by parameter name, or None
+        for styles with per-frame randomness (shake, glitch).
+        """
+        if style in ("shake", "glitch"):
+            return None
+
+        progress = np.arange(total_frames) / total_frames
+        alpha = np.ones(total_frames)
+        offset_y = np.zeros(total_frames, dtype=int)
+        scale = np.ones(total_frames)
+        glow_intensity = np.zeros(total_frames)
+
+        if style == "fade":
+            alpha = np.minimum(1.0, progress * 2)
+
+        elif style == "pulse":
+            alpha = 0.5 + 0.5 * (0.5 + 0.5 * (progress * 6 % 2 - 1))
+            glow_intensity = (alpha - 0.5) * 2
+
+        elif style in ("slide_up", "slide_down"):
+            alpha = np.minimum(1.0, progress * 1.5)
+            offset_y = ((1 - alpha) * 100).astype(int)
+            if style == "slide_down":
+                offset_y = -offset_y
+
+        elif style == "bounce":
+            t = np.minimum(1.0, progress * 3)
+            alpha = t * t * (3 - 2 * t)
+            offset_y = ((1 - alpha) * 50).astype(int)
+
+        elif style == "glow":
+            alpha = np.minimum(1.0, progress * 1.5)
+            glow_intensity = alpha * 0.8
+
+        elif style == "typewriter":
+            alpha = np.minimum(1.0, progress * 3)
+
+        elif style == "zoom":
+            t = np.minimum(1.0, progress * 2)
+            scale = 0.5 + 0.5 * t
+            alpha = t
+
+        elif style == "wave":
+            alpha = np.minimum(1.0, progress * 1.5)
+            offset_y = (alpha * 10 * (progress * 10 % 2 - 1)).astype(int)
+
+        return {
+            'alpha': alpha,
+            'offset_y': offset_y,
+            'offset_x': np.zeros(total_frames, dtype=int),
+            'scale': scale,
+            'glow_intensity': glow_intensity,
+            'glitch_amount': np.zeros(total_frames, dtype=int),
+        }
+
     def _apply_glitch(self, img: Image.Image, amount: int):
         """Apply RGB split glitch effect."""
         if amount <= 0:
             return
 
-        r, g, b = img.split()
-
         offset = random.randint(-amount, amount)
+        if offset == 0:
+            return
 
+        arr = np.array(img)
+        red = arr[:, :, 0]
+
+        # Shift red channel horizontally, blanking the columns it uncovers
         if offset > 0:
-            # Shift red channel right
-            r_new = Image.new('L', (self.width, self.height), 0)
-            r_new.paste(r, (offset, 0))
-            r = r_new
-        elif offset < 0:
-            # Shift red channel left
-            r_new = Image.new('L', (self.width, self.height), 0)
-            r_new.paste(r, (-offset, 0))
-            r = r_new
-
-        # Merge channels back
-        glitched = Image.merge('RGB', (r, g, b))
-        img.paste(glitched, (0, 0))
-
-    def _apply_glow(self, img: Image.Image, color: str, intensity: float):
-        """Add outer glow effect."""
+            red[:, offset:] = red[:, :-offset]
+            red[:, :offset] = 0
+        else:
+            red[:, :offset] = red[:, -offset:]
+            red[:, offset:] = 0
+
+        img.paste(Image.fromarray(arr), (0, 0))
+
+    def _apply_glow(self, img: Image.Image, color: str, intensity: float, text_mask: Image.Image):
+        """
+        Add outer glow effect: paint color through a blurred copy of
+        text_mask (an 'L' image of the text), before the text is drawn.
+        """
         if intensity <= 0:
             return
 
-        rgb = self._hex_to_rgb(color)
-        draw = ImageDraw.Draw(img)
-
-        for i in range(3, 0, -1):
-            glow_alpha = int(intensity * 50 / i)
-            glow_rgba = rgb + (glow_alpha,)
-            # Glow would need separate layer processing for true effect
-            # Simplified: just draw multiple text layers
+        glow = text_mask.filter(ImageFilter.GaussianBlur(radius=intensity * 8))
+        if intensity < 1:
+            glow = glow.point(lambda v: int(v * intensity))
+        img.paste(self._hex_to_rgb(color), None, glow)
 
     def create_batch(self, posts: List[Dict[str, Any]], output_dir: str = "."):
-        """Create multiple GIFs from a list of post definitions."""
+        """
+        Create multiple GIFs from a list of post definitions.
+        With more than one worker, posts are rendered in parallel, one per process.
+        """
         os.makedirs(output_dir, exist_ok=True)
 
-        results = []
+        jobs = []
         for i, post in enumerate(posts):
             text = post.get('text', '')
             filename = post.get('output', f'output_{i}.gif')
             style = post.get('style', 'fade')
             output_path = os.path.join(output_dir, filename)
 
-            self.create_text_gif(
-                text=text,
-                output_path=output_path,
-                style=style,
-                bg_colors=post.get('bg_colors', self.default_colors()),
-                text_color=post.get('text_color', '#ffffff'),
-                signature=post.get('signature'),
-                logo_path=post.get('logo_path'),
-                logo_position=post.get('logo_position', 'bottom-right')
-            )
-            results.append(output_path)
-
-        return results
+            jobs.append({
+                'text': text,
+                'output_path': output_path,
+                'style': style,
+                'bg_colors': post.get('bg_colors', self.default_colors()),
+                'text_color': post.get('text_color', '#ffffff'),
+                'signature': post.get('signature'),
+                'logo_path': post.get('logo_path'),
+                'logo_position': post.get('logo_position', 'bottom-right'),
+                'cache_frames': False,
+            })
+
+        workers = min(self.workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            # Posts are independent and each writes its own file
+            with multiprocessing.Pool(workers) as pool:
+                pool.map(_create_batch_post, [(self._init_args(), job) for job in jobs])
+        else:
+            for job in jobs:
+                self.create_text_gif(**job)
+
+        return [job['output_path'] for job in jobs]
 
     def default_colors(self) -> List[str]:
         """Default gradient colors."""
@@ -488,6 +743,107 @@ def draw_text_scaled(draw, text: str, x: int, y: int, font: ImageFont, color: st
     draw.text((x, y), text, font=font, fill=rgba, anchor="mm")
 
 
+def _copy_into(frames: Iterator[Image.Image], frames_arr: np.ndarray) -> Iterator[Image.Image]:
+    """Pass frames through, copying each into the next slot of frames_arr."""
+    for i, frame in enumerate(frames):
+        frames_arr[i] = np.asarray(frame)
+        yield frame
+
+
+def _gifsicle_optimize(path: str, quality: int) -> bool:
+    """
+    Optimize a GIF in place with gifsicle, lossier as quality drops
+    (--lossy=30 at the default of 85). Returns False if gifsicle failed.
+    """
+    cmd = [GIFSICLE, '-O3', f'--lossy={(100 - quality) * 2}', '-o', path, path]
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=120).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _pipe_frames(frames: Iterator[Image.Image], write: Callable[[bytes], Any]) -> Iterator[Image.Image]:
+    """Pass frames through, writing each one's raw RGB bytes with write."""
+    for frame in frames:
+        write(frame.tobytes())
+        yield frame
+
+
+def _ffmpeg_exe() -> str:
+    """Path of the ffmpeg bundled with imageio-ffmpeg, else of one on PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        pass
+    exe = shutil.which("ffmpeg")
+    if exe is None:
+        raise ImportError("ffmpeg not found. Run: pip install imageio-ffmpeg")
+    return exe
+
+
+@contextmanager
+def _ffmpeg_writer(output_path: str, width: int, height: int, fps: int,
+                   codec: str, bitrate: str) -> Iterator[Callable[[bytes], Any]]:
+    """
+    Run ffmpeg encoding raw rgb24 frames from its stdin into output_path and
+    yield the function writing to that pipe. Frames are encoded as they
+    arrive, so none of them has to be held in memory.
+    """
+    cmd = [
+        _ffmpeg_exe(), '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+        '-s', f'{width}x{height}', '-r', str(fps), '-i', 'pipe:0',
+        '-c:v', codec, '-b:v', bitrate,
+        # yuv420p for player compatibility; it needs even dimensions
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+        output_path,
+    ]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        yield proc.stdin.write
+        proc.stdin.close()
+    except BrokenPipeError:
+        # ffmpeg exited early; its stderr says why
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = proc.stderr.read()
+        proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+
+# Frame renderer and options of a pool worker, set by _init_frame_worker()
+_worker_render = None
+_worker_quantize = False
+
+
+def _init_frame_worker(maker_args: Dict[str, Any], render_args: Dict[str, Any], quantize: bool):
+    """Pool initializer: redo the per-animation setup once per worker."""
+    global _worker_render, _worker_quantize
+    _worker_render = GifMaker(**maker_args)._build_frame_renderer(**render_args)
+    _worker_quantize = quantize
+
+
+def _render_frame_worker(frame_num: int) -> Image.Image:
+    """Render one frame in a pool worker."""
+    frame = _worker_render(frame_num)
+    if _worker_quantize:
+        # Same conversion the GIF encoder would otherwise do serially
+        frame = frame.convert("P", palette=Image.Palette.ADAPTIVE)
+    return frame
+
+
+def _create_batch_post(job: tuple):
+    """Create one batch GIF in a pool worker (frames are rendered serially there)."""
+    maker_args, gif_args = job
+    GifMaker(**maker_args).create_text_gif(**gif_args)
+
+
 def main():
     """CLI entry point."""
     import argparse
@@ -524,6 +880,7 @@ def main():
     parser.add_argument("--auto-upload", action="store_true", help="Create and upload in one step (implies --upload)")
     parser.add_argument("--bitrate", default="2M", help="MP4 bitrate (e.g., 2M, 5M)")
     parser.add_argument("--codec", default="libx264", help="MP4 codec (e.g., libx264, libx265)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to render frames (0 = one per CPU)")
 
     args = parser.parse_args()
 
@@ -536,25 +893,24 @@ def main():
         with open(args.batch, 'r') as f:
             posts = json.load(f)
 
-        maker = GifMaker(width=args.width, height=args.height, duration=args.duration, font_size=args.font_size)
+        maker = GifMaker(width=args.width, height=args.height, duration=args.duration, font_size=args.font_size, workers=args.workers)
         results = maker.create_batch(posts)
         print(f"\n✅ Created {len(results)} GIFs")
 
         # Upload batch files if requested
         if upload:
-            for result_path in results:
-                try:
-                    url = maker.upload_to_catbox(result_path)
+            for url in maker.upload_many(results):
+                if isinstance(url, Exception):
+                    print(f"⚠️  Upload failed: {url}")
+                else:
                     print(f"✅ Uploaded: {url}")
-                except Exception as e:
-                    print(f"⚠️  Upload failed: {e}")
         return
 
     # Single mode
     if not args.text:
         parser.error("text is required (unless using --batch)")
 
-    maker = GifMaker(width=args.width, height=args.height, duration=args.duration, font_size=args.font_size)
+    maker = GifMaker(width=args.width, height=args.height, duration=args.duration, font_size=args.font_size, workers=args.workers)
 
     # Use create_and_upload for automatic workflow
     if args.auto_upload:
@@ -578,7 +934,8 @@ def main():
         if results['mp4_url']:
             print(f"   MP4:  {results['mp4_url']}")
     else:
-        # Create GIF first
+        # Create GIF, streaming the MP4 alongside it if requested
+        mp4_path = args.output.rsplit('.', 1)[0] + '.mp4' if export_mp4 else None
         maker.create_text_gif(
             text=args.text,
             output_path=args.output,
@@ -588,14 +945,13 @@ def main():
             signature=args.signature,
             logo_path=args.logo,
             logo_position=args.logo_pos,
-            quality=args.quality
+            quality=args.quality,
+            cache_frames=False,
+            mp4_path=mp4_path,
+            codec=args.codec,
+            bitrate=args.bitrate
         )
 
-        # Export MP4 if requested
-        if export_mp4:
-            mp4_path = args.output.rsplit('.', 1)[0] + '.mp4'
-            maker.export_mp4(mp4_path, codec=args.codec, bitrate=args.bitrate)
-
         # Upload if requested
         if upload:
             try:
@@ -5,21 +5,34 @@ Create multi-headline slideshow GIFs for 30-second social media content.
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import textwrap
-from typing import List, Optional
+import multiprocessing
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional
 import os
 
+from _slideshow import _ink_pieces, _init_frame_worker, _render_frame_worker, _to_palette, _write_mp4
+
 
 class SlideshowGifMaker:
     def __init__(
         self,
         width: int = 640,
         height: int = 360,
-        fps: int = 30
+        fps: int = 30,
+        workers: int = 1
     ):
         self.width = width
         self.height = height
         self.fps = fps
+        self.workers = workers  # Frame-rendering processes (0 = one per CPU)
+
+    def _init_args(self) -> Dict[str, Any]:
+        """Constructor arguments for an equivalent maker in a worker process."""
+        return {'width': self.width, 'height': self.height, 'fps': self.fps}
 
     def _load_font(self, size: int = 36) -> ImageFont.FreeTypeFont:
         """Load font, falling back to default if not found."""
@@ -39,36 +52,35 @@ class SlideshowGifMaker:
 
     def create_gradient_background(self, colors: List[str]) -> Image.Image:
         """Create a gradient background from color list."""
-        img = Image.new('RGB', (self.width, self.height), colors[0])
-        draw = ImageDraw.Draw(img)
-
         if len(colors) == 1:
-            return img
-
-        for y in range(self.height):
-            ratio = y / self.height
-
-            if len(colors) == 2:
-                c1 = self._hex_to_rgb(colors[0])
-                c2 = self._hex_to_rgb(colors[1])
-                color = tuple(int(c1[i] + (c2[i] - c1[i]) * ratio) for i in range(3))
-            else:
-                if ratio < 0.5:
-                    r = ratio * 2
-                    c1 = self._hex_to_rgb(colors[0])
-                    c2 = self._hex_to_rgb(colors[1])
-                else:
-                    r = (ratio - 0.5) * 2
-                    c1 = self._hex_to_rgb(colors[1])
-                    c2 = self._hex_to_rgb(colors[2])
-                color = tuple(int(c1[i] + (c2[i] - c1[i]) * r) for i in range(3))
-
-            draw.line([(0, y), (self.width, y)], fill=color)
-
-        return img
-
-    def _hex_to_rgb(self, hex_color: str) -> tuple:
-        """Convert hex color to RGB tuple."""
+            return Image.new('RGB', (self.width, self.height), colors[0])
+
+        # Per-row interpolation ratio, broadcast across the width below
+        ratio = np.arange(self.height) / self.height
+
+        # Handle 2-color or 3-color gradient
+        if len(colors) == 2:
+            c1 = np.array(self._hex_to_rgb(colors[0]), dtype=np.float64)
+            c2 = np.array(self._hex_to_rgb(colors[1]), dtype=np.float64)
+            rows = c1 + (c2 - c1) * ratio[:, None]
+        else:
+            # 3-color gradient: first half blends 0->1, second half 1->2
+            c0, c1, c2 = (np.array(self._hex_to_rgb(c), dtype=np.float64) for c in colors[:3])
+            first = ratio < 0.5
+            r = np.where(first, ratio * 2, (ratio - 0.5) * 2)[:, None]
+            start = np.where(first[:, None], c0, c1)
+            end = np.where(first[:, None], c1, c2)
+            rows = start + (end - start) * r
+
+        # Truncate like int() did per row; stretching the 1px-wide column is
+        # a C-level row fill, cheaper than materializing HxWx3 in NumPy
+        column = Image.fromarray(rows.astype(np.uint8)[:, None, :], 'RGB')
+        return column.resize((self.width, self.height), Image.Resampling.NEAREST)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _hex_to_rgb(hex_color: str) -> tuple:
+        """Convert hex color to RGB tuple (memoized; callers reuse a few colors)."""
         hex_color = hex_color.lstrip('#')
         if len(hex_color) == 3:
             hex_color = ''.join(c * 2 for c in hex_color)
@@ -76,14 +88,185 @@ class SlideshowGifMaker:
 
     def wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
         """Wrap text to fit within max_width."""
+        # Approximate characters per line from half the width of an 'M'
+        char_width = max(1, font.getbbox('M')[2] // 2)
+        max_chars = max(1, max_width // char_width)
         lines = []
         for line in text.split('\n'):
             if not line.strip():
                 continue
-            wrapped = textwrap.wrap(line, width=max_width // (font.getbbox('M')[2] // 2))
-            lines.extend(wrapped)
+            lines.extend(textwrap.wrap(line, width=max_chars))
         return lines
 
+    def _headline_layer(
+        self,
+        lines: List[str],
+        num_text: Optional[str],
+        signature: str,
+        fonts: tuple,
+        text_color: str
+    ) -> List[tuple]:
+        """
+        Draw a headline's number, shadowed lines and signature at full opacity
+        onto a transparent layer. Returns its inked parts as _ink_pieces() does;
+        each frame scales their alpha to fade the text in and out.
+        """
+        title_font, num_font, sig_font = fonts
+        rgb = self._hex_to_rgb(text_color)
+        layer = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        # 'RGBA' blending keeps antialiased edges at their ink color
+        draw = ImageDraw.Draw(layer, 'RGBA')
+
+        # Headline number
+        if num_text:
+            draw.text((self.width // 2, 40), num_text, font=num_font, fill=rgb + (180,), anchor="mm")
+
+        # Headline lines
+        line_height = 45
+        total_height = len(lines) * line_height
+        y_start = (self.height - total_height) // 2 + 10
+
+        for i, line in enumerate(lines):
+            text_y = y_start + i * line_height
+            text_x = self.width // 2
+
+            # Shadow for visibility, then main text
+            draw.text((text_x + 2, text_y + 2), line, font=title_font, fill=(0, 0, 0, 80), anchor="mm")
+            draw.text((text_x, text_y), line, font=title_font, fill=rgb + (255,), anchor="mm")
+
+        # Signature at bottom
+        draw.text((self.width // 2, self.height - 25), signature, font=sig_font, fill=(255, 255, 255, 200), anchor="mm")
+
+        return _ink_pieces(layer)
+
+    def _build_frame_renderer(
+        self,
+        headlines: List[str],
+        total_duration: int,
+        bg_colors: List[str],
+        text_color: str,
+        signature: str,
+        headline_number: bool,
+        font_size: int,
+        skip_frames: int
+    ) -> tuple:
+        """
+        Do the per-slideshow setup. Returns (render, repeats, key_frame):
+        render(i) draws the i-th distinct frame, which is shown for
+        repeats[i] kept frames, and key_frame is the first frame with the
+        text at full opacity. Frames only depend on their index, so they
+        can be rendered in any order.
+        """
+        # Load fonts
+        title_font = self._load_font(font_size)
+        num_font = self._load_font(24)
+        sig_font = self._load_font(14)
+
+        # Calculate duration per headline
+        num_headlines = len(headlines)
+        frames_per_headline = int((self.fps * total_duration) / num_headlines)
+        total_frames = frames_per_headline * num_headlines
+
+        # Pre-wrap all headlines
+        wrapped_headlines = []
+        for hl in headlines:
+            lines = self.wrap_text(hl, title_font, self.width - 100)
+            wrapped_headlines.append(lines)
+
+        # The background is the same for every frame
+        background = self.create_gradient_background(bg_colors)
+
+        # Text only changes per headline; frames just fade its layer in and out
+        fonts = (title_font, num_font, sig_font)
+        layers = [
+            self._headline_layer(
+                lines,
+                f"{i + 1}/{num_headlines}" if headline_number else None,
+                signature, fonts, text_color
+            )
+            for i, lines in enumerate(wrapped_headlines)
+        ]
+
+        # Progress bar at bottom
+        bar_width = int(self.width * 0.8)
+        bar_height = 4
+        bar_x = (self.width - bar_width) // 2
+        bar_y = self.height - 15
+        bar_bottom = bar_y + bar_height + 1
+
+        # The bar's track is white at 50/255 opacity and the same in every
+        # frame: blend it into the background once. Boxes are inclusive of
+        # bar_x + width like draw.rectangle's corners
+        track_box = (bar_x, bar_y, bar_x + bar_width + 1, bar_bottom)
+        track = background.crop(track_box)
+        background.paste(Image.blend(track, Image.new('RGB', track.size, 'white'), 50 / 255), track_box)
+
+        # Everything a kept frame's pixels depend on, for all of them at once:
+        # headline, opacity (fade in, hold, fade out) and progress bar width
+        frame_nums = np.arange(0, total_frames, skip_frames)
+        headline_indices, frames_in_headline = np.divmod(frame_nums, frames_per_headline)
+        local_progress = frames_in_headline / frames_per_headline
+        alphas = np.where(
+            local_progress < 0.15, local_progress / 0.15,
+            np.where(local_progress > 0.85, (1 - local_progress) / 0.15, 1.0)
+        )
+        progress_widths = (bar_width * (frame_nums / total_frames)).astype(int)
+        states = zip(headline_indices.tolist(), alphas.tolist(), progress_widths.tolist())
+
+        # Kept frames with the same state are identical: render each run of
+        # them once and show it for the run's combined duration
+        runs = [(state, sum(1 for _ in group)) for state, group in groupby(states)]
+
+        def render_frame(i: int) -> Image.Image:
+            (headline_index, alpha, progress_width), _ = runs[i]
+
+            # Copy background
+            bg = background.copy()
+
+            # Composite the headline's text layer at this frame's opacity
+            if alpha >= 1.0:
+                for colors, mask, offset in layers[headline_index]:
+                    bg.paste(colors, offset, mask)
+            elif alpha > 0:
+                fade = [int(v * alpha) for v in range(256)]
+                for colors, mask, offset in layers[headline_index]:
+                    bg.paste(colors, offset, mask.point(fade))
+
+            # Progress bar: a plain fill straight into the frame, over the track
+            bg.paste(text_color, (bar_x, bar_y, bar_x + progress_width + 1, bar_bottom))
+
+            return bg
+
+        key_frame = max(range(len(runs)), key=lambda i: runs[i][0][1])
+        return render_frame, [count for _, count in runs], key_frame
+
+    @contextmanager
+    def _render_frames(self, render_args: Dict[str, Any], quantize: bool = False) -> Iterator[tuple]:
+        """
+        Yield (frames, repeats): an iterator over the distinct frames, in
+        order, and how many kept frames each one stands for. If quantize is
+        set, frames come in palette mode, sharing one palette. With more
+        than one worker, frames are rendered (and quantized) by a process pool.
+        """
+        render, repeats, key_frame = self._build_frame_renderer(**render_args)
+
+        # Map every frame onto one palette built from a frame with all its
+        # colors: cheap per frame, unlike a fresh ADAPTIVE palette each
+        palette = render(key_frame).quantize() if quantize else None
+
+        workers = min(self.workers or os.cpu_count() or 1, len(repeats))
+        if workers == 1:
+            frames = map(render, range(len(repeats)))
+            if palette is not None:
+                frames = (_to_palette(frame, palette) for frame in frames)
+            yield frames, repeats
+            return
+
+        initargs = (type(self), self._init_args(), render_args, palette)
+        with multiprocessing.Pool(workers, initializer=_init_frame_worker, initargs=initargs) as pool:
+            chunksize = max(1, len(repeats) // (workers * 4))
+            yield pool.imap(_render_frame_worker, range(len(repeats)), chunksize), repeats
+
     def create_slideshow_gif(
         self,
         headlines: List[str],
@@ -94,7 +277,8 @@ class SlideshowGifMaker:
         signature: str = "🐈 nanobot.srik.me",
         headline_number: bool = True,
         font_size: int = 32,
-        skip_frames: int = 3  # Skip every N frames for faster rendering
+        skip_frames: int = 3,  # Skip every N frames for faster rendering
+        mp4_path: Optional[str] = None
     ):
         """
         Create a slideshow GIF with multiple headlines.
@@ -109,115 +293,51 @@ class SlideshowGifMaker:
             headline_number: Show headline numbers (1/N, 2/N, etc.)
             font_size: Font size for headlines
             skip_frames: Skip every N frames for faster rendering (higher = faster, lower = smoother)
+            mp4_path: Also write the frames to this MP4 as they are rendered
         """
-        frames = []
-
-        # Load fonts
-        title_font = self._load_font(font_size)
-        num_font = self._load_font(24)
-        sig_font = self._load_font(14)
-
-        # Calculate duration per headline
-        num_headlines = len(headlines)
-        frames_per_headline = int((self.fps * total_duration) / num_headlines)
-        total_frames = frames_per_headline * num_headlines
-
-        # Pre-wrap all headlines
-        wrapped_headlines = []
-        for hl in headlines:
-            lines = self.wrap_text(hl, title_font, self.width - 100)
-            wrapped_headlines.append(lines)
-
-        headline_index = 0
-        frame_in_headline = 0
-
-        for frame_num in range(total_frames):
-            # Determine which headline to show
-            headline_index = frame_num // frames_per_headline
-            frame_in_headline = frame_num % frames_per_headline
-
-            # Progress within this headline (0 to 1)
-            local_progress = frame_in_headline / frames_per_headline
-
-            # Animation: Fade in, hold, fade out
-            alpha = 1.0
-            if local_progress < 0.15:
-                # Fade in
-                alpha = local_progress / 0.15
-            elif local_progress > 0.85:
-                # Fade out
-                alpha = (1 - local_progress) / 0.15
-
-            # Create background
-            bg = self.create_gradient_background(bg_colors)
-            draw = ImageDraw.Draw(bg)
-
-            # Current headline
-            current_lines = wrapped_headlines[headline_index]
-            current_headline = headlines[headline_index]
-
-            # Draw headline number
-            if headline_number:
-                num_text = f"{headline_index + 1}/{num_headlines}"
-                num_rgba = self._hex_to_rgb(text_color) + (int(alpha * 180),)
-                draw.text((self.width // 2, 40), num_text, font=num_font, fill=num_rgba, anchor="mm")
-
-            # Draw headline lines
-            line_height = 45
-            total_height = len(current_lines) * line_height
-            y_start = (self.height - total_height) // 2 + 10
-
-            for i, line in enumerate(current_lines):
-                text_y = y_start + i * line_height
-                text_x = self.width // 2
-
-                # Shadow for visibility
-                shadow_rgba = (0, 0, 0, int(alpha * 80))
-                draw.text((text_x + 2, text_y + 2), line, font=title_font, fill=shadow_rgba, anchor="mm")
-
-                # Main text with alpha
-                rgb = self._hex_to_rgb(text_color)
-                rgba = rgb + (int(alpha * 255),)
-                draw.text((text_x, text_y), line, font=title_font, fill=rgba, anchor="mm")
-
-            # Draw signature at bottom
-            sig_rgba = (255, 255, 255, int(alpha * 200))
-            draw.text((self.width // 2, self.height - 25), signature, font=sig_font, fill=sig_rgba, anchor="mm")
-
-            # Progress bar at bottom
-            bar_width = int(self.width * 0.8)
-            bar_height = 4
-            bar_x = (self.width - bar_width) // 2
-            bar_y = self.height - 15
-
-            # Progress background
-            draw.rectangle([bar_x, bar_y, bar_x + bar_width, bar_y + bar_height], fill=(255, 255, 255, 50))
-
-            # Progress fill
-            progress_width = int(bar_width * ((headline_index * frames_per_headline + frame_in_headline) / total_frames))
-            draw.rectangle([bar_x, bar_y, bar_x + progress_width, bar_y + bar_height], fill=text_color)
-
-            # Skip frames for faster rendering
-            if frame_num % skip_frames == 0:
-                frames.append(bg)
-
-        # Save as GIF
-        save_opts = {
-            'save_all': True,
-            'append_images': frames[1:],
-            'duration': 1000 // self.fps,
-            'loop': 0,
-            'disposal': 2,
-            'optimize': True
+        render_args = {
+            'headlines': headlines,
+            'total_duration': total_duration,
+            'bg_colors': bg_colors,
+            'text_color': text_color,
+            'signature': signature,
+            'headline_number': headline_number,
+            'font_size': font_size,
+            'skip_frames': skip_frames,
         }
+        num_headlines = len(headlines)
 
-        frames[0].save(output_path, **save_opts)
+        # Frames fed to the MP4 writer must reach us as RGB, not palettized
+        with self._render_frames(render_args, quantize=not mp4_path) as (frames, repeats):
+            if mp4_path:
+                frames = _write_mp4(frames, repeats, mp4_path, (self.width, self.height), self.fps / skip_frames)
+            first_frame = next(frames)
+
+            # Only every skip_frames-th frame is kept, so each stands in for
+            # skip_frames frames of playback (the MP4 runs at fps / skip_frames)
+            frame_ms = 1000 * skip_frames // self.fps
+
+            # Save as GIF, streaming the remaining frames into the encoder
+            save_opts = {
+                'save_all': True,
+                'append_images': frames,
+                'duration': [frame_ms * count for count in repeats],
+                'loop': 0,
+                'disposal': 2,
+                # Shared-palette frames have nothing left to optimize
+                'optimize': bool(mp4_path)
+            }
+
+            first_frame.save(output_path, **save_opts)
+        num_frames = sum(repeats)
 
         file_size = os.path.getsize(output_path) / 1024
         print(f"✅ Slideshow GIF saved to: {output_path}")
         print(f"   Duration: {total_duration}s, Headlines: {num_headlines}")
-        print(f"   Size: {len(frames)} frames, {self.width}x{self.height}")
+        print(f"   Size: {num_frames} frames, {self.width}x{self.height}")
         print(f"   File: {file_size:.1f} KB ({file_size/1024:.2f} MB)")
+        if mp4_path:
+            print(f"✅ MP4 saved to: {mp4_path}")
 
 
 def main():
@@ -236,10 +356,12 @@ def main():
     parser.add_argument("--signature", default="🐈 nanobot.srik.me", help="Signature text")
     parser.add_argument("--no-numbers", action="store_true", help="Don't show headline numbers")
     parser.add_argument("--font-size", type=int, default=32, help="Font size")
+    parser.add_argument("--mp4", action="store_true", help="Also export as MP4 (same filename, .mp4 extension)")
+    parser.add_argument("--workers", type=int, default=1, help="Frame-rendering processes (0 = one per CPU)")
 
     args = parser.parse_args()
 
-    maker = SlideshowGifMaker(width=args.width, height=args.height, fps=30)
+    maker = SlideshowGifMaker(width=args.width, height=args.height, fps=30, workers=args.workers)
     maker.create_slideshow_gif(
         headlines=args.headlines,
         output_path=args.output,
@@ -248,7 +370,8 @@ def main():
         text_color=args.text_color,
         signature=args.signature,
         headline_number=not args.no_numbers,
-        font_size=args.font_size
+        font_size=args.font_size,
+        mp4_path=args.output.rsplit('.', 1)[0] + '.mp4' if args.mp4 else None
     )
 
 
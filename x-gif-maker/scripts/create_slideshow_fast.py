@@ -5,15 +5,29 @@ Quick slideshow GIF generation for social media.
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import textwrap
-from typing import List, Optional
+import multiprocessing
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional
 import os
 
+from _slideshow import _ink_pieces, _init_frame_worker, _render_frame_worker, _to_palette, _write_mp4
+
+FPS = 15  # Lower FPS for faster generation
+
 
 class FastSlideshowGifMaker:
-    def __init__(self, width: int = 640, height: int = 360):
+    def __init__(self, width: int = 640, height: int = 360, workers: int = 1):
         self.width = width
         self.height = height
+        self.workers = workers  # Frame-rendering processes (0 = one per CPU)
+
+    def _init_args(self) -> Dict[str, Any]:
+        """Constructor arguments for an equivalent maker in a worker process."""
+        return {'width': self.width, 'height': self.height}
 
     def _load_font(self, size: int = 36) -> ImageFont.FreeTypeFont:
         """Load font, falling back to default if not found."""
@@ -30,37 +44,84 @@ class FastSlideshowGifMaker:
 
         return ImageFont.load_default()
 
-    def _hex_to_rgb(self, hex_color: str) -> tuple:
-        """Convert hex color to RGB tuple."""
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _hex_to_rgb(hex_color: str) -> tuple:
+        """Convert hex color to RGB tuple (memoized; callers reuse a few colors)."""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
     def wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
         """Wrap text to fit within max_width."""
+        # Approximate characters per line from half the width of an 'M'
+        char_width = max(1, font.getbbox('M')[2] // 2)
+        max_chars = max(1, max_width // char_width)
         lines = []
         for line in text.split('\n'):
             if not line.strip():
                 continue
-            wrapped = textwrap.wrap(line, width=max_width // (font.getbbox('M')[2] // 2))
-            lines.extend(wrapped)
+            lines.extend(textwrap.wrap(line, width=max_chars))
         return lines
 
-    def create_slideshow_gif(
+    def _headline_layer(
+        self,
+        lines: List[str],
+        num_text: str,
+        signature: str,
+        fonts: tuple,
+        text_rgb: tuple
+    ) -> List[tuple]:
+        """
+        Draw a headline's number, shadowed lines and signature at full opacity
+        onto a transparent layer. Returns its inked parts as _ink_pieces() does;
+        each frame scales their alpha to fade the text in and out.
+        """
+        title_font, num_font, sig_font = fonts
+        layer = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        # 'RGBA' blending keeps antialiased edges at their ink color
+        draw = ImageDraw.Draw(layer, 'RGBA')
+
+        # Headline number
+        draw.text((self.width // 2, 35), num_text,
+                  font=num_font, fill=text_rgb + (150,), anchor="mm")
+
+        # Headline lines
+        line_height = 40
+        total_height = len(lines) * line_height
+        y_start = (self.height - total_height) // 2
+
+        for i, line in enumerate(lines):
+            text_y = y_start + i * line_height
+            # Shadow
+            draw.text((self.width // 2 + 2, text_y + 2), line,
+                      font=title_font, fill=(0, 0, 0, 80), anchor="mm")
+            # Main text
+            draw.text((self.width // 2, text_y), line,
+                      font=title_font, fill=text_rgb + (255,), anchor="mm")
+
+        # Signature
+        draw.text((self.width // 2, self.height - 22), signature,
+                  font=sig_font, fill=(255, 255, 255, 180), anchor="mm")
+
+        return _ink_pieces(layer)
+
+    def _build_frame_renderer(
         self,
         headlines: List[str],
-        output_path: str,
-        duration_per_headline: float = 3.0,
-        bg_color: str = "#1a1a2e",
-        text_color: str = "#ffffff",
-        signature: str = "🐈 nanobot.srik.me",
-        font_size: int = 28
-    ):
+        duration_per_headline: float,
+        bg_color: str,
+        text_color: str,
+        signature: str,
+        font_size: int
+    ) -> tuple:
         """
-        Create a slideshow GIF with multiple headlines (fast version).
+        Do the per-slideshow setup. Returns (render, repeats, key_frame):
+        render(i) draws the i-th distinct frame, which is shown for
+        repeats[i] frames, and key_frame is the first frame with the text
+        at full opacity. Frames only depend on their index, so they can be
+        rendered in any order.
         """
-        frames = []
-        fps = 15  # Lower FPS for faster generation
-        frames_per_headline = int(fps * duration_per_headline)
+        frames_per_headline = int(FPS * duration_per_headline)
 
         # Load fonts
         title_font = self._load_font(font_size)
@@ -77,68 +138,123 @@ class FastSlideshowGifMaker:
             lines = self.wrap_text(hl, title_font, self.width - 100)
             wrapped_headlines.append(lines)
 
-        for headline_index, (headline, lines) in enumerate(zip(headlines, wrapped_headlines)):
-            # Create frames for this headline
-            for frame_num in range(frames_per_headline):
-                progress = frame_num / frames_per_headline
-
-                # Fade in/out
-                if progress < 0.1:
-                    alpha = progress / 0.1
-                elif progress > 0.9:
-                    alpha = (1 - progress) / 0.1
-                else:
-                    alpha = 1.0
-
-                # Create simple background
-                img = Image.new('RGB', (self.width, self.height), bg_rgb)
-                draw = ImageDraw.Draw(img)
-
-                # Headline number
-                num_rgba = text_rgb + (int(alpha * 150),)
-                draw.text((self.width // 2, 35), f"{headline_index + 1}/{num_headlines}",
-                          font=num_font, fill=num_rgba, anchor="mm")
-
-                # Headline lines
-                line_height = 40
-                total_height = len(lines) * line_height
-                y_start = (self.height - total_height) // 2
-
-                for i, line in enumerate(lines):
-                    text_y = y_start + i * line_height
-                    # Shadow
-                    shadow_rgba = (0, 0, 0, int(alpha * 80))
-                    draw.text((self.width // 2 + 2, text_y + 2), line,
-                              font=title_font, fill=shadow_rgba, anchor="mm")
-                    # Main text
-                    text_rgba = text_rgb + (int(alpha * 255),)
-                    draw.text((self.width // 2, text_y), line,
-                              font=title_font, fill=text_rgba, anchor="mm")
-
-                # Signature
-                sig_rgba = (255, 255, 255, int(alpha * 180))
-                draw.text((self.width // 2, self.height - 22), signature,
-                          font=sig_font, fill=sig_rgba, anchor="mm")
-
-                frames.append(img)
-
-        # Save as GIF
-        frames[0].save(
-            output_path,
-            save_all=True,
-            append_images=frames[1:],
-            duration=1000 // fps,
-            loop=0,
-            disposal=2,
-            optimize=True
-        )
+        # Draw each headline's text once; frames only fade its layer in and out
+        fonts = (title_font, num_font, sig_font)
+        layers = [
+            self._headline_layer(lines, f"{i + 1}/{num_headlines}", signature, fonts, text_rgb)
+            for i, lines in enumerate(wrapped_headlines)
+        ]
+
+        # Fade in/out: opacity by frame within a headline
+        progress = np.arange(frames_per_headline) / frames_per_headline
+        alphas = np.where(
+            progress < 0.1, progress / 0.1,
+            np.where(progress > 0.9, (1 - progress) / 0.1, 1.0)
+        ).tolist()
+
+        # Frames of a headline with the same opacity are identical (the whole
+        # hold phase): render each run once, shown for its combined duration
+        runs = [(alpha, sum(1 for _ in group)) for alpha, group in groupby(alphas)]
+
+        def render_frame(i: int) -> Image.Image:
+            headline_index, run = divmod(i, len(runs))
+            alpha = runs[run][0]
+
+            # Create simple background
+            img = Image.new('RGB', (self.width, self.height), bg_rgb)
+
+            # Composite the text layer at this frame's opacity
+            if alpha >= 1.0:
+                for colors, mask, offset in layers[headline_index]:
+                    img.paste(colors, offset, mask)
+            elif alpha > 0:
+                fade = [int(v * alpha) for v in range(256)]
+                for colors, mask, offset in layers[headline_index]:
+                    img.paste(colors, offset, mask.point(fade))
+
+            return img
+
+        key_frame = max(range(len(runs)), key=lambda run: runs[run][0])
+        return render_frame, [count for _, count in runs] * num_headlines, key_frame
+
+    @contextmanager
+    def _render_frames(self, render_args: Dict[str, Any], quantize: bool = False) -> Iterator[tuple]:
+        """
+        Yield (frames, repeats): an iterator over the distinct frames, in
+        order, and how many frames each one stands for. If quantize is set,
+        frames come in palette mode, sharing one palette. With more than one
+        worker, frames are rendered (and quantized) by a process pool.
+        """
+        render, repeats, key_frame = self._build_frame_renderer(**render_args)
+
+        # Map every frame onto one palette built from a frame with all its
+        # colors: cheap per frame, unlike a fresh ADAPTIVE palette each
+        palette = render(key_frame).quantize() if quantize else None
+
+        workers = min(self.workers or os.cpu_count() or 1, len(repeats))
+        if workers == 1:
+            frames = map(render, range(len(repeats)))
+            if palette is not None:
+                frames = (_to_palette(frame, palette) for frame in frames)
+            yield frames, repeats
+            return
+
+        initargs = (type(self), self._init_args(), render_args, palette)
+        with multiprocessing.Pool(workers, initializer=_init_frame_worker, initargs=initargs) as pool:
+            chunksize = max(1, len(repeats) // (workers * 4))
+            yield pool.imap(_render_frame_worker, range(len(repeats)), chunksize), repeats
+
+    def create_slideshow_gif(
+        self,
+        headlines: List[str],
+        output_path: str,
+        duration_per_headline: float = 3.0,
+        bg_color: str = "#1a1a2e",
+        text_color: str = "#ffffff",
+        signature: str = "🐈 nanobot.srik.me",
+        font_size: int = 28,
+        mp4_path: Optional[str] = None
+    ):
+        """
+        Create a slideshow GIF with multiple headlines (fast version).
+        With mp4_path, the frames are also written to an MP4 as they are rendered.
+        """
+        render_args = {
+            'headlines': headlines,
+            'duration_per_headline': duration_per_headline,
+            'bg_color': bg_color,
+            'text_color': text_color,
+            'signature': signature,
+            'font_size': font_size,
+        }
+        num_headlines = len(headlines)
+
+        # Frames fed to the MP4 writer must reach us as RGB, not palettized
+        with self._render_frames(render_args, quantize=not mp4_path) as (frames, repeats):
+            if mp4_path:
+                frames = _write_mp4(frames, repeats, mp4_path, (self.width, self.height), FPS)
+            first_frame = next(frames)
+
+            # Save as GIF, streaming the remaining frames into the encoder
+            first_frame.save(
+                output_path,
+                save_all=True,
+                append_images=frames,
+                duration=[(1000 // FPS) * count for count in repeats],
+                loop=0,
+                disposal=2,
+                # Shared-palette frames have nothing left to optimize
+                optimize=bool(mp4_path)
+            )
 
         file_size = os.path.getsize(output_path) / 1024
         total_duration = num_headlines * duration_per_headline
         print(f"✅ Slideshow GIF: {output_path}")
         print(f"   Duration: {total_duration}s, Headlines: {num_headlines}")
-        print(f"   Size: {len(frames)} frames, {self.width}x{self.height}")
+        print(f"   Size: {sum(repeats)} frames, {self.width}x{self.height}")
         print(f"   File: {file_size:.1f} KB")
+        if mp4_path:
+            print(f"✅ MP4: {mp4_path}")
 
 
 def main():
@@ -151,10 +267,12 @@ def main():
     parser.add_argument("--text-color", default="#ffffff", help="Text color")
     parser.add_argument("--signature", default="🐈 nanobot.srik.me", help="Signature")
     parser.add_argument("--font-size", type=int, default=28, help="Font size")
+    parser.add_argument("--mp4", action="store_true", help="Also export as MP4 (same filename, .mp4 extension)")
+    parser.add_argument("--workers", type=int, default=1, help="Frame-rendering processes (0 = one per CPU)")
 
     args = parser.parse_args()
 
-    maker = FastSlideshowGifMaker()
+    maker = FastSlideshowGifMaker(workers=args.workers)
     maker.create_slideshow_gif(
         headlines=args.headlines,
         output_path=args.output,
@@ -162,7 +280,8 @@ def main():
         bg_color=args.bg,
         text_color=args.text_color,
         signature=args.signature,
-        font_size=args.font_size
+        font_size=args.font_size,
+        mp4_path=args.output.rsplit('.', 1)[0] + '.mp4' if args.mp4 else None
     )
 
 
@@ -15,6 +15,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.create_gif import GifMaker
 
+# The slideshow scripts import their shared helpers as top-level modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from _slideshow import _ink_pieces, _write_mp4
+from create_slideshow import SlideshowGifMaker
+from create_slideshow_fast import FastSlideshowGifMaker
+
 
 class TestGifMakerBasics:
     """Test basic GifMaker functionality."""
@@ -44,6 +51,12 @@ class TestGifMakerBasics:
         assert maker._hex_to_rgb("#fff") == (255, 255, 255)
         assert maker._hex_to_rgb("ffffff") == (255, 255, 255)
 
+    def test_font_is_cached(self):
+        """Test fonts are loaded once per size and shared between makers."""
+        font = GifMaker()._load_font(20)
+        assert GifMaker()._load_font(20) is font
+        assert GifMaker()._load_font(21) is not font
+
     def test_default_colors(self):
         """Test default color palette."""
         maker = GifMaker()
@@ -78,6 +91,18 @@ class TestGradientBackground:
         assert bg.size == (640, 360)
         assert bg.mode == "RGB"
 
+    def test_gradient_pixel_values(self):
+        """Test gradient rows interpolate between the given colors."""
+        maker = GifMaker(width=8, height=4)
+        bg = maker.create_gradient_background(["#000000", "#ff0000"])
+        # Row y uses ratio y / height, truncated to int
+        assert [bg.getpixel((0, y)) for y in range(4)] == [(0, 0, 0), (63, 0, 0), (127, 0, 0), (191, 0, 0)]
+        # Every row is a single solid color
+        assert bg.getpixel((7, 2)) == bg.getpixel((0, 2))
+
+        bg = maker.create_gradient_background(["#000000", "#ff0000", "#0000ff"])
+        assert [bg.getpixel((3, y)) for y in range(4)] == [(0, 0, 0), (127, 0, 0), (255, 0, 0), (127, 0, 127)]
+
 
 class TestAnimationStyles:
     """Test animation style parameters."""
@@ -172,6 +197,106 @@ class TestAnimationStyles:
         assert isinstance(glitch, int)
 
 
+    def test_schedule_matches_per_frame_params(self):
+        """Test the vectorized schedule equals per-frame parameters."""
+        from scripts.create_gif import ANIMATION_PARAMS
+
+        maker = GifMaker()
+        styles = ["fade", "pulse", "slide_up", "slide_down", "bounce",
+                  "glow", "typewriter", "zoom", "wave", "unknown"]
+        for style in styles:
+            for total_frames in (1, 7, 60):
+                schedule = maker._build_animation_schedule(style, total_frames)
+                for i in range(total_frames):
+                    expected = maker._get_animation_params(style, i / total_frames)
+                    actual = tuple(schedule[name][i] for name in ANIMATION_PARAMS)
+                    assert actual == expected, (style, total_frames, i)
+
+    def test_schedule_skips_random_styles(self):
+        """Test random styles fall back to per-frame parameters."""
+        maker = GifMaker()
+        assert maker._build_animation_schedule("shake", 10) is None
+        assert maker._build_animation_schedule("glitch", 10) is None
+
+
+class TestEffects:
+    """Test per-frame image effects."""
+
+    def test_text_sprite_matches_draw_text(self):
+        """Test pasting through a text sprite gives the pixels of draw.text."""
+        from PIL import Image, ImageDraw
+
+        maker = GifMaker(width=200, height=80)
+        font = maker._load_font(32)
+        drawn = Image.new("RGB", (200, 80), (40, 80, 120))
+        pasted = drawn.copy()
+
+        # Partly off-canvas, as sliding text is
+        for x, y in ((100, 40), (-10, 70)):
+            ImageDraw.Draw(drawn).text((x, y), "Hey gjq", font=font, fill="#ffcc00", anchor="mm")
+            mask, (dx, dy) = maker._text_sprite("Hey gjq", font)
+            pasted.paste("#ffcc00", (x + dx, y + dy), mask)
+
+        assert drawn.tobytes() == pasted.tobytes()
+
+    def test_logo_loaded_once(self, tmp_path):
+        """Test the logo is decoded once and pasted from the cache after."""
+        from PIL import Image
+
+        logo_path = str(tmp_path / "logo.png")
+        Image.new("RGBA", (10, 10), (255, 0, 0, 255)).save(logo_path)
+        maker = GifMaker(width=100, height=100)
+
+        for i in range(2):
+            img = Image.new("RGB", (100, 100))
+            maker._apply_logo(img, logo_path, "top-left", size=20)
+            assert img.getpixel((20, 20)) == (255, 0, 0)
+            if i == 0:
+                # Later frames must not need the file again
+                os.remove(logo_path)
+
+        assert list(maker._logo_cache) == [(logo_path, 20)]
+
+    def test_glitch_shifts_red_channel(self, monkeypatch):
+        """Test glitch moves the red channel by the random offset, either way."""
+        from PIL import Image
+
+        maker = GifMaker(width=4, height=1)
+        for offset, expected in ((1, [0, 10, 20, 30]), (-1, [20, 30, 40, 0])):
+            img = Image.new("RGB", (4, 1))
+            img.putdata([(10, 1, 2), (20, 1, 2), (30, 1, 2), (40, 1, 2)])
+            monkeypatch.setattr("scripts.create_gif.random.randint", lambda a, b: offset)
+            maker._apply_glitch(img, 5)
+            pixels = [img.getpixel((x, 0)) for x in range(4)]
+            assert [px[0] for px in pixels] == expected
+            assert all(px[1:] == (1, 2) for px in pixels)
+
+
+    def test_glow_paints_around_text(self):
+        """Test glow tints pixels around the text mask, scaled by intensity."""
+        from PIL import Image
+
+        maker = GifMaker(width=40, height=40)
+        mask = Image.new("L", (40, 40), 0)
+        mask.paste(255, (18, 18, 22, 22))
+
+        img = Image.new("RGB", (40, 40), (0, 0, 0))
+        maker._apply_glow(img, "#ff0000", 0, mask)
+        assert img.getpixel((20, 20)) == (0, 0, 0)
+
+        faint = Image.new("RGB", (40, 40), (0, 0, 0))
+        maker._apply_glow(faint, "#ff0000", 0.5, mask)
+        img = Image.new("RGB", (40, 40), (0, 0, 0))
+        maker._apply_glow(img, "#ff0000", 1.0, mask)
+        # Blur spreads the glow beyond the mask, in the glow color only
+        assert img.getpixel((16, 20))[0] > 0
+        assert img.getpixel((16, 20))[1:] == (0, 0)
+        red_total = sum(img.getchannel("R").histogram()[v] * v for v in range(256))
+        faint_total = sum(faint.getchannel("R").histogram()[v] * v for v in range(256))
+        assert red_total > faint_total > 0
+        assert img.getpixel((0, 0)) == (0, 0, 0)
+
+
 class TestGifCreation:
     """Test GIF creation functionality."""
 
@@ -247,6 +372,67 @@ class TestGifCreation:
 
         assert os.path.exists(output_path)
 
+    def test_frames_cached_as_array(self, tmp_path):
+        """Test cached frames form one (frames, height, width, 3) uint8 array."""
+        maker = GifMaker(width=320, height=180, duration=1, fps=10)
+        output_path = str(tmp_path / "test_cache.gif")
+
+        maker.create_text_gif(text="Cache", output_path=output_path, style="slide_up")
+
+        assert maker.frames_cache.shape == (10, 180, 320, 3)
+        assert maker.frames_cache.dtype == "uint8"
+        # Frames differ while the text slides in
+        assert (maker.frames_cache[0] != maker.frames_cache[5]).any()
+
+    def test_fade_style_fades_text(self, tmp_path):
+        """Test faded frames blend the text into the background."""
+        maker = GifMaker(width=320, height=180, duration=1, fps=10)
+        output_path = str(tmp_path / "test_fade.gif")
+
+        maker.create_text_gif(
+            text="Fade", output_path=output_path, style="fade",
+            bg_colors=["#000000"], text_color="#ffffff", signature=""
+        )
+
+        # alpha is 0.2 on the second frame and 1.0 from the sixth
+        faded, opaque = maker.frames_cache[1], maker.frames_cache[5]
+        assert opaque.max() == 255
+        assert faded.max() < 128
+
+    def test_streamed_frames_not_cached(self, tmp_path):
+        """Test cache_frames=False streams frames without keeping them."""
+        maker = GifMaker(width=320, height=180, duration=1, fps=10)
+        output_path = str(tmp_path / "test_stream.gif")
+
+        maker.create_text_gif(
+            text="Stream",
+            output_path=output_path,
+            style="fade",
+            cache_frames=False
+        )
+
+        assert os.path.exists(output_path)
+        assert maker.frames_cache is None
+        with pytest.raises(RuntimeError):
+            maker.export_mp4(str(tmp_path / "test_stream.mp4"))
+
+    def test_parallel_rendering_matches_serial(self, tmp_path):
+        """Test rendering frames in worker processes gives the same GIF."""
+        outputs = []
+        for workers in (1, 2):
+            maker = GifMaker(width=320, height=180, duration=1, fps=10, workers=workers)
+            output_path = str(tmp_path / f"test_workers_{workers}.gif")
+            maker.create_text_gif(
+                text="Parallel",
+                output_path=output_path,
+                style="slide_up",
+                cache_frames=False
+            )
+            with open(output_path, 'rb') as f:
+                outputs.append(f.read())
+
+        assert outputs[0] == outputs[1]
+
     def test_long_text_wrapping(self, tmp_path):
         """Test that long text is wrapped properly."""
         maker = GifMaker(width=320, height=180, duration=1, fps=10)
@@ -261,6 +447,35 @@ class TestGifCreation:
 
         assert os.path.exists(output_path)
 
+    def test_gifsicle_optimizes_when_available(self, tmp_path, monkeypatch):
+        """Test gifsicle replaces Pillow's optimizer when it is installed."""
+        import subprocess
+        from PIL import Image
+
+        calls = []
+        save_kwargs = []
+        pil_save = Image.Image.save
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0)
+
+        def save(self, fp, format=None, **params):
+            save_kwargs.append(params)
+            return pil_save(self, fp, format, **params)
+
+        monkeypatch.setattr("scripts.create_gif.GIFSICLE", "gifsicle")
+        monkeypatch.setattr("scripts.create_gif.subprocess.run", run)
+        monkeypatch.setattr(Image.Image, "save", save)
+        maker = GifMaker(width=320, height=180, duration=1, fps=10)
+        output_path = str(tmp_path / "test.gif")
+
+        maker.create_text_gif(text="Hi", output_path=output_path, quality=85, cache_frames=False)
+        maker.create_text_gif(text="Hi", output_path=output_path, quality=100, cache_frames=False)
+
+        assert calls == [["gifsicle", "-O3", "--lossy=30", "-o", output_path, output_path]]
+        assert save_kwargs[0]['optimize'] is False
+
 
 class TestMP4Export:
     """Test MP4 export functionality."""
@@ -294,6 +509,122 @@ class TestMP4Export:
         file_size = os.path.getsize(mp4_path)
         assert file_size > 0
 
+    def test_mp4_streamed_without_cache(self, tmp_path):
+        """Test encoding the MP4 while the GIF renders, with odd dimensions."""
+        try:
+            import imageio_ffmpeg  # noqa: F401
+        except ImportError:
+            pytest.skip("imageio-ffmpeg not installed")
+
+        maker = GifMaker(width=321, height=181, duration=1, fps=10)
+        gif_path = str(tmp_path / "test.gif")
+        mp4_path = str(tmp_path / "test.mp4")
+
+        maker.create_text_gif(
+            text="Test MP4",
+            output_path=gif_path,
+            style="fade",
+            cache_frames=False,
+            mp4_path=mp4_path
+        )
+
+        assert maker.frames_cache is None
+        assert os.path.getsize(gif_path) > 0
+        assert os.path.getsize(mp4_path) > 0
+
+
+def _gif_duration_ms(path):
+    """Total playback time of a GIF, in milliseconds."""
+    from PIL import Image, ImageSequence
+
+    with Image.open(path) as gif:
+        return sum(frame.info['duration'] for frame in ImageSequence.Iterator(gif))
+
+
+class TestSlideshow:
+    """Test slideshow GIF creation in both slideshow makers."""
+
+    def test_slideshow_plays_for_total_duration(self, tmp_path):
+        """Test the per-run frame durations add up to total_duration."""
+        maker = SlideshowGifMaker(width=320, height=180, fps=10)
+        output_path = str(tmp_path / "slideshow.gif")
+
+        maker.create_slideshow_gif(["First", "Second"], output_path, total_duration=3)
+
+        assert _gif_duration_ms(output_path) == pytest.approx(3000, rel=0.05)
+
+    def test_fast_slideshow_plays_for_each_headline(self, tmp_path):
+        """Test the fast slideshow plays duration_per_headline per headline."""
+        maker = FastSlideshowGifMaker(width=320, height=180)
+        output_path = str(tmp_path / "slideshow_fast.gif")
+
+        maker.create_slideshow_gif(["First", "Second"], output_path, duration_per_headline=1.0)
+
+        assert _gif_duration_ms(output_path) == pytest.approx(2000, rel=0.05)
+
+    def test_slideshow_parallel_matches_serial(self, tmp_path):
+        """Test rendering slideshow frames in worker processes gives the same GIF."""
+        outputs = []
+        for workers in (1, 2):
+            output_path = str(tmp_path / f"slideshow_{workers}.gif")
+            maker = SlideshowGifMaker(width=320, height=180, fps=10, workers=workers)
+            maker.create_slideshow_gif(["First", "Second"], output_path, total_duration=3)
+            with open(output_path, 'rb') as f:
+                outputs.append(f.read())
+
+        assert outputs[0] == outputs[1]
+
+    def test_fast_slideshow_parallel_matches_serial(self, tmp_path):
+        """Test rendering fast slideshow frames in worker processes gives the same GIF."""
+        outputs = []
+        for workers in (1, 2):
+            output_path = str(tmp_path / f"slideshow_fast_{workers}.gif")
+            maker = FastSlideshowGifMaker(width=320, height=180, workers=workers)
+            maker.create_slideshow_gif(["First", "Second"], output_path, duration_per_headline=1.0)
+            with open(output_path, 'rb') as f:
+                outputs.append(f.read())
+
+        assert outputs[0] == outputs[1]
+
+    def test_ink_pieces_rebuild_layer(self):
+        """Test pasting the ink pieces back gives the original layer."""
+        from PIL import Image, ImageDraw
+        import numpy as np
+
+        layer = Image.new('RGBA', (200, 120), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(layer)
+        draw.text((20, 10), "Top line", fill=(255, 200, 0, 255))
+        draw.rectangle((50, 80, 150, 100), fill=(10, 20, 30, 128))
+
+        pieces = _ink_pieces(layer)
+
+        # One piece per band of inked rows
+        assert len(pieces) == 2
+        rebuilt = Image.new('RGBA', layer.size, (0, 0, 0, 0))
+        for colors, mask, offset in pieces:
+            piece = colors.convert('RGBA')
+            piece.putalpha(mask)
+            rebuilt.paste(piece, offset)
+        assert np.array_equal(np.asarray(rebuilt), np.asarray(layer))
+
+    def test_write_mp4_repeats_frames(self, tmp_path):
+        """Test each frame is encoded as many times as its run repeats."""
+        try:
+            import imageio_ffmpeg
+        except ImportError:
+            pytest.skip("imageio-ffmpeg not installed")
+        from PIL import Image
+
+        frames = [Image.new('RGB', (64, 48), color) for color in ('red', 'green', 'blue')]
+        repeats = [1, 3, 2]
+        mp4_path = str(tmp_path / "slideshow.mp4")
+
+        passed = list(_write_mp4(iter(frames), repeats, mp4_path, (64, 48), 10))
+
+        assert passed == frames
+        num_frames, _ = imageio_ffmpeg.count_frames_and_secs(mp4_path)
+        assert num_frames == sum(repeats)
+
 
 class TestBatchCreation:
     """Test batch GIF creation."""
@@ -314,6 +645,21 @@ class TestBatchCreation:
             assert os.path.exists(result)
 
 
+    def test_parallel_batch_creation(self, tmp_path):
+        """Test creating batch GIFs in worker processes."""
+        posts = [
+            {"text": "First", "output": "first.gif", "style": "fade"},
+            {"text": "Second", "output": "second.gif", "style": "slide_up"},
+        ]
+
+        maker = GifMaker(width=320, height=180, duration=1, fps=10, workers=2)
+        results = maker.create_batch(posts, output_dir=str(tmp_path))
+
+        assert results == [str(tmp_path / "first.gif"), str(tmp_path / "second.gif")]
+        for result in results:
+            assert os.path.exists(result)
+
+
 class TestUpload:
     """Test upload functionality (mocked)."""
 
@@ -323,6 +669,30 @@ class TestUpload:
         with pytest.raises(FileNotFoundError):
             maker.upload_to_catbox("/nonexistent/path.gif")
 
+    def test_upload_many_reuses_session(self, tmp_path, monkeypatch):
+        """Test batch uploads share one session and keep input order."""
+        maker = GifMaker()
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.gif"
+            path.write_bytes(b"GIF89a")
+            paths.append(str(path))
+
+        class Response:
+            status_code = 200
+
+            def __init__(self, name):
+                self.text = f"https://files.catbox.moe/{name}\n"
+
+        def post(url, files, timeout):
+            return Response(files['fileToUpload'][0])
+
+        monkeypatch.setattr(maker._session, "post", post)
+        urls = maker.upload_many(paths + ["/nonexistent/path.gif"])
+
+        assert urls[:3] == [f"https://files.catbox.moe/{i}.gif" for i in range(3)]
+        assert isinstance(urls[3], FileNotFoundError)
+
 
 class TestCLI:
     """Test CLI interface."""
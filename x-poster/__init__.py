@@ -2,6 +2,6 @@
 X (Twitter) Posting Skill
 """
 
-from .poster import post_tweet, post_thread, delete_tweet, get_tweet
+from .poster import post_tweet, post_thread, post_thread_async, delete_tweet, get_tweet, get_tweets
 
-__all__ = ["post_tweet", "post_thread", "delete_tweet", "get_tweet"]
+__all__ = ["post_tweet", "post_thread", "post_thread_async", "delete_tweet", "get_tweet", "get_tweets"]
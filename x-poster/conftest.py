@@ -0,0 +1,22 @@
+"""
+pytest setup for x-poster.
+
+"x-poster" is not a valid package name, so pytest's default import mode
+loads this directory's __init__.py as a top-level module named "__init__",
+where its relative import of poster fails. Load it as a package under that
+name first; pytest reuses the module it finds in sys.modules.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+_SKILL_DIR = Path(__file__).parent
+
+if "__init__" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "__init__", _SKILL_DIR / "__init__.py", submodule_search_locations=[str(_SKILL_DIR)]
+    )
+    _package = importlib.util.module_from_spec(_spec)
+    sys.modules["__init__"] = _package
+    _spec.loader.exec_module(_package)
@@ -4,41 +4,213 @@ X (Twitter) Posting Module
 """
 
 import os
-import tweepy
-import requests
+import re
+import json
+import time
+import functools
+import threading
+import unicodedata
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+
+# tweepy (and asyncio, for the async API) take ~0.1s to import: functions
+# import them when they first need them, so the CLI can reject bad input
+# without paying for it
+if TYPE_CHECKING:
+    import tweepy
+
+# Environment variable holding each credential, by tweepy keyword argument
+CREDENTIAL_ENV_VARS = {
+    "consumer_key": "X_API_KEY",
+    "consumer_secret": "X_API_SECRET",
+    "access_token": "X_ACCESS_TOKEN",
+    "access_token_secret": "X_ACCESS_TOKEN_SECRET",
+}
+
+TWEET_LOOKUP_BATCH = 100  # Max IDs per GET /2/tweets lookup
+# Fields get_tweets() asks for by default, beyond id and text
+DEFAULT_TWEET_FIELDS = ["created_at", "public_metrics"]
+
+_STATUS_PREFIX = "https://x.com/i/web/status/"
+
+# Tweet length as X counts it (twitter-text v3): every URL counts as
+# TWEET_URL_LENGTH, every emoji as 2 however many code points it is built
+# from, code points in _LIGHT_RANGES as 1 and all others (CJK, ...) as 2
+MAX_TWEET_LENGTH = 280
+TWEET_URL_LENGTH = 23
+EMOJI_LENGTH = 2
+_URL_RE = re.compile(r'https?://\S+', re.IGNORECASE)
+_LIGHT_RANGES = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+# Emoji variation selectors and skin tones modify the previous character
+_ZERO_WIDTH_RANGES = ((0xFE00, 0xFE0F), (0x1F3FB, 0x1F3FF))
+# Multi-code-point emoji: ZWJ sequences (👨‍👩‍👧), flags (🇺🇸),
+# subdivision flags (England, Scotland, Wales) and keycaps (1️⃣)
+_EMOJI_PART = '[\u2600-\u27BF\U0001F000-\U0001FAFF][\uFE0F\U0001F3FB-\U0001F3FF]*'
+_EMOJI_SEQUENCE_RE = re.compile(
+    f'{_EMOJI_PART}(?:\u200D{_EMOJI_PART})+'
+    '|[\U0001F1E6-\U0001F1FF]{2}'
+    '|\U0001F3F4[\U000E0020-\U000E007E]+\U000E007F'
+    '|[0-9#*]\uFE0F?\u20E3'
+)
+
+# Larger media, and any GIF, needs the chunked INIT/APPEND/FINALIZE upload
+SIMPLE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024
+
+# Client-side request budgets per endpoint: (requests, per seconds)
+RATE_LIMITS = {
+    "create_tweet": (300, 3 * 60 * 60),
+    "delete_tweet": (50, 15 * 60),
+    "get_tweet": (900, 15 * 60),
+}
+
+
+class _RateLimiter:
+    """
+    One token bucket per endpoint, refilled continuously at its RATE_LIMITS
+    rate. Callers take a token before each request and wait while the bucket
+    is empty, instead of bursting into 429 errors partway through a batch.
+    """
+
+    def __init__(self, limits: Dict[str, tuple]):
+        self._limits = limits
+        self._buckets = {}  # endpoint -> (tokens, time.monotonic() of last update)
+        self._lock = threading.Lock()
+
+    def reserve(self, endpoint: str) -> float:
+        """Take a token for endpoint. Returns how many seconds to wait before using it."""
+        capacity, period = self._limits[endpoint]
+        rate = capacity / period
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(endpoint, (capacity, now))
+            # Tokens go negative while callers queue up for the next refills
+            tokens = min(capacity, tokens + (now - updated) * rate) - 1
+            self._buckets[endpoint] = (tokens, now)
+        return max(0.0, -tokens / rate)
+
+    def drain(self, endpoint: str, error: "tweepy.TooManyRequests") -> None:
+        """Empty endpoint's bucket until the server's window resets, after a 429."""
+        capacity, period = self._limits[endpoint]
+        reset = error.response.headers.get("x-rate-limit-reset")
+        wait = max(0.0, float(reset) - time.time()) if reset else 0.0
+        with self._lock:
+            # One token left to refill by then: the next caller waits out the reset
+            self._buckets[endpoint] = (1 - wait * capacity / period, time.monotonic())
+
+
+_rate_limiter = _RateLimiter(RATE_LIMITS)
+
+
+def _rate_limited(endpoint: str, call, *args, **kwargs):
+    """Make a tweepy call once endpoint's rate limit allows it."""
+    import tweepy
+
+    time.sleep(_rate_limiter.reserve(endpoint))
+    try:
+        return call(*args, **kwargs)
+    except tweepy.TooManyRequests as e:
+        _rate_limiter.drain(endpoint, e)
+        raise
 
 
-def get_client() -> tweepy.Client:
+def _credentials() -> Dict[str, str]:
     """
-    Get an authenticated tweepy client.
+    Read the X API credentials from the environment.
 
     Returns:
-        tweepy.Client: Authenticated client
+        Dict of tweepy client keyword arguments
 
     Raises:
         ValueError: If credentials are not set
     """
-    api_key = os.environ.get("X_API_KEY")
-    api_secret = os.environ.get("X_API_SECRET")
-    access_token = os.environ.get("X_ACCESS_TOKEN")
-    access_token_secret = os.environ.get("X_ACCESS_TOKEN_SECRET")
+    credentials = {key: os.environ.get(var) for key, var in CREDENTIAL_ENV_VARS.items()}
 
-    if not all([api_key, api_secret, access_token, access_token_secret]):
+    if not all(credentials.values()):
         raise ValueError(
             "Missing X API credentials. Set X_API_KEY, X_API_SECRET, "
             "X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET environment variables."
         )
 
-    return tweepy.Client(
-        consumer_key=api_key,
-        consumer_secret=api_secret,
-        access_token=access_token,
-        access_token_secret=access_token_secret
+    return credentials
+
+
+def _char_weight(char: str) -> int:
+    """How much a character counts toward a tweet's length."""
+    code = ord(char)
+    if any(low <= code <= high for low, high in _LIGHT_RANGES):
+        return 1
+    if any(low <= code <= high for low, high in _ZERO_WIDTH_RANGES):
+        return 0
+    return 2
+
+
+def _tweet_length(text: str) -> int:
+    """Length of a tweet as X counts it toward MAX_TWEET_LENGTH."""
+    text = unicodedata.normalize("NFC", text)
+    urls = _URL_RE.findall(text)
+    rest = _URL_RE.sub("", text)
+    emoji = _EMOJI_SEQUENCE_RE.findall(rest)
+    rest = _EMOJI_SEQUENCE_RE.sub("", rest)
+    return (
+        len(urls) * TWEET_URL_LENGTH
+        + len(emoji) * EMOJI_LENGTH
+        + sum(_char_weight(char) for char in rest)
     )
 
 
+@functools.lru_cache(maxsize=1)
+def get_client() -> "tweepy.Client":
+    """
+    Get an authenticated tweepy client.
+
+    The client is created once and reused, so every call shares its
+    HTTP session and keep-alive connections.
+
+    Returns:
+        tweepy.Client: Authenticated client
+
+    Raises:
+        ValueError: If credentials are not set
+    """
+    import tweepy
+
+    return tweepy.Client(**_credentials())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_api() -> "tweepy.API":
+    """Get the cached v1.1 API object, which is still needed for media upload."""
+    import tweepy
+
+    return tweepy.API(tweepy.OAuth1UserHandler(**_credentials()))
+
+
+def _tweet_result(tweet_id: str) -> Dict[str, Any]:
+    """The id and url dict returned for each posted tweet."""
+    return {"id": tweet_id, "url": _STATUS_PREFIX + str(tweet_id)}
+
+
+def _upload_media(image_path: str) -> int:
+    """
+    Upload an image or GIF through the cached v1.1 API.
+
+    Returns:
+        The uploaded media's ID
+    """
+    path = Path(image_path)
+    is_gif = path.suffix.lower() == ".gif"
+    if is_gif or path.stat().st_size > SIMPLE_UPLOAD_MAX_BYTES:
+        # Chunked upload takes GIFs up to 15MB; the simple upload stops at 5MB
+        media = _get_api().media_upload(
+            filename=image_path,
+            chunked=True,
+            media_category="tweet_gif" if is_gif else "tweet_image"
+        )
+    else:
+        media = _get_api().media_upload(filename=image_path)
+    return media.media_id
+
+
 def post_tweet(
     text: str,
     image_path: Optional[str] = None,
@@ -55,38 +227,48 @@ def post_tweet(
     Returns:
         Dict with tweet id and url
     """
-    client = get_client()
-
     # Check character limit
-    if len(text) > 280:
-        raise ValueError(f"Tweet text too long: {len(text)} characters (max 280)")
+    length = _tweet_length(text)
+    if length > MAX_TWEET_LENGTH:
+        raise ValueError(f"Tweet text too long: {length} characters (max {MAX_TWEET_LENGTH})")
+
+    client = get_client()
 
     media_ids = []
     if image_path:
         # Need to use v1.1 API for media upload
-        api = tweepy.API(
-            tweepy.OAuth1UserHandler(
-                os.environ["X_ACCESS_TOKEN"],
-                os.environ["X_ACCESS_TOKEN_SECRET"],
-                os.environ["X_API_KEY"],
-                os.environ["X_API_SECRET"]
-            )
-        )
-        media = api.media_upload(filename=image_path)
-        media_ids.append(media.media_id)
+        media_ids.append(_upload_media(image_path))
 
     # Post the tweet
-    response = client.create_tweet(
+    response = _rate_limited(
+        "create_tweet",
+        client.create_tweet,
         text=text,
         media_ids=media_ids or None,
         in_reply_to_tweet_id=reply_to
     )
 
-    tweet_id = response.data["id"]
-    return {
-        "id": tweet_id,
-        "url": f"https://x.com/i/web/status/{tweet_id}"
-    }
+    return _tweet_result(response.data["id"])
+
+
+def _check_thread(tweets: List[str]) -> None:
+    """
+    Validate a whole thread up front, so a bad tweet can't leave
+    a half-posted thread behind.
+
+    Raises:
+        ValueError: If the thread is empty, too long, or has a tweet over 280 characters
+    """
+    if not tweets:
+        raise ValueError("Tweet list cannot be empty")
+
+    if len(tweets) > 25:
+        raise ValueError("Thread too long: max 25 tweets")
+
+    for i, text in enumerate(tweets):
+        length = _tweet_length(text)
+        if length > MAX_TWEET_LENGTH:
+            raise ValueError(f"Tweet {i+1} too long: {length} characters")
 
 
 def post_thread(tweets: List[str]) -> List[Dict[str, Any]]:
@@ -99,35 +281,74 @@ def post_thread(tweets: List[str]) -> List[Dict[str, Any]]:
     Returns:
         List of tweet dicts with id and url
     """
-    if not tweets:
-        raise ValueError("Tweet list cannot be empty")
-
-    if len(tweets) > 25:
-        raise ValueError("Thread too long: max 25 tweets")
+    _check_thread(tweets)
 
+    client = get_client()
     results = []
     previous_tweet_id = None
 
-    for i, text in enumerate(tweets):
-        if len(text) > 280:
-            raise ValueError(f"Tweet {i+1} too long: {len(text)} characters")
-
-        client = get_client()
-
+    for text in tweets:
         if previous_tweet_id:
-            response = client.create_tweet(
+            response = _rate_limited(
+                "create_tweet",
+                client.create_tweet,
                 text=text,
                 in_reply_to_tweet_id=previous_tweet_id
             )
         else:
-            response = client.create_tweet(text=text)
+            response = _rate_limited("create_tweet", client.create_tweet, text=text)
 
         tweet_id = response.data["id"]
         previous_tweet_id = tweet_id
-        results.append({
-            "id": tweet_id,
-            "url": f"https://x.com/i/web/status/{tweet_id}"
-        })
+        results.append(_tweet_result(tweet_id))
+
+    return results
+
+
+async def post_thread_async(tweets: List[str]) -> List[Dict[str, Any]]:
+    """
+    Post a thread of connected tweets without blocking the event loop.
+
+    Each tweet replies to the previous one, so they are still posted in
+    order, but over a single aiohttp session.
+    Requires: pip install "tweepy[async]"
+
+    Args:
+        tweets: List of tweet texts
+
+    Returns:
+        List of tweet dicts with id and url
+    """
+    _check_thread(tweets)
+
+    import asyncio
+    import tweepy
+    try:
+        import aiohttp
+        from tweepy.asynchronous import AsyncClient
+    except (ImportError, tweepy.TweepyException):
+        raise ImportError('tweepy async support not installed. Run: pip install "tweepy[async]"')
+
+    client = AsyncClient(**_credentials())
+    results = []
+    previous_tweet_id = None
+
+    async with aiohttp.ClientSession() as session:
+        client.session = session
+        for text in tweets:
+            await asyncio.sleep(_rate_limiter.reserve("create_tweet"))
+            try:
+                response = await client.create_tweet(
+                    text=text,
+                    in_reply_to_tweet_id=previous_tweet_id
+                )
+            except tweepy.TooManyRequests as e:
+                _rate_limiter.drain("create_tweet", e)
+                raise
+
+            tweet_id = response.data["id"]
+            previous_tweet_id = tweet_id
+            results.append(_tweet_result(tweet_id))
 
     return results
 
@@ -143,33 +364,99 @@ def delete_tweet(tweet_id: int) -> bool:
         True if successful
     """
     client = get_client()
-    client.delete_tweet(tweet_id)
+    _rate_limited("delete_tweet", client.delete_tweet, tweet_id)
     return True
 
 
-def get_tweet(tweet_id: int) -> Dict[str, Any]:
+def get_tweet(tweet_id: int, tweet_fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get a tweet by ID.
 
     Args:
         tweet_id: Tweet ID to fetch
+        tweet_fields: Optional extra tweet fields to fetch along with id and text
+                      (e.g. ["created_at", "public_metrics"])
 
     Returns:
         Dict with tweet data
     """
     client = get_client()
-    response = client.get_tweet(tweet_id)
+    response = _rate_limited("get_tweet", client.get_tweet, tweet_id, tweet_fields=tweet_fields)
     return response.data
 
 
+def get_tweets(
+    tweet_ids: List[int],
+    tweet_fields: Optional[List[str]] = DEFAULT_TWEET_FIELDS
+) -> Dict[int, Any]:
+    """
+    Get several tweets by ID, looking up to 100 per request.
+
+    Args:
+        tweet_ids: Tweet IDs to fetch
+        tweet_fields: Tweet fields to fetch along with id and text
+                      (default: DEFAULT_TWEET_FIELDS; None for just id and text)
+
+    Returns:
+        Dict of tweet ID -> tweet data, in the order of tweet_ids. Tweets that
+        could not be fetched (e.g. deleted or protected) are left out.
+    """
+    client = get_client()
+    tweet_ids = [int(tweet_id) for tweet_id in tweet_ids]
+
+    found = {}
+    for start in range(0, len(tweet_ids), TWEET_LOOKUP_BATCH):
+        chunk = tweet_ids[start:start + TWEET_LOOKUP_BATCH]
+        response = _rate_limited("get_tweet", client.get_tweets, ids=chunk, tweet_fields=tweet_fields)
+        for tweet in response.data or []:
+            found[tweet.id] = tweet
+
+    return {tweet_id: found[tweet_id] for tweet_id in tweet_ids if tweet_id in found}
+
+
+def _read_batch(path: str) -> List[str]:
+    """
+    Read tweet texts from a JSONL file.
+
+    Args:
+        path: File with one tweet per line, as a JSON string or an object
+              with a "text" field; blank lines are skipped
+
+    Returns:
+        List of tweet texts, in file order
+    """
+    texts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            texts.append(item["text"] if isinstance(item, dict) else item)
+    return texts
+
+
 # CLI interface
 if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
         print("Usage: python poster.py <text> [--image <path>] [--reply <id>]")
+        print("       python poster.py --batch <tweets.jsonl>")
         sys.exit(1)
 
+    if sys.argv[1] == "--batch":
+        # Post the whole file as one thread from this one process
+        try:
+            if len(sys.argv) < 3:
+                raise ValueError("--batch needs a JSONL file path")
+            results = post_thread(_read_batch(sys.argv[2]))
+            for i, result in enumerate(results):
+                print(f"✅ Posted {i+1}/{len(results)}: {result['url']}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
     text = sys.argv[1]
     image_path = None
     reply_to = None
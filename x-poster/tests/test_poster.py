@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the x-poster module's offline logic (no X API calls).
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import poster
+
+
+class TestTweetLength:
+    """Test _tweet_length() against X's weighted counting."""
+
+    def test_ascii_counts_one_per_character(self):
+        assert poster._tweet_length("Hello, world!") == 13
+
+    def test_cjk_counts_two(self):
+        assert poster._tweet_length("日本語") == 6
+
+    def test_url_counts_as_fixed_length(self):
+        text = "Read https://example.com/a/very/long/path?with=query now"
+        assert poster._tweet_length(text) == len("Read ") + poster.TWEET_URL_LENGTH + len(" now")
+
+    def test_single_emoji_counts_two(self):
+        assert poster._tweet_length("🎉") == 2
+
+    def test_emoji_modifiers_count_with_their_emoji(self):
+        assert poster._tweet_length("👍🏽") == 2
+        assert poster._tweet_length("\u2764\uFE0F") == 2
+
+    @pytest.mark.parametrize("emoji", [
+        "\U0001F468\u200D\U0001F469\u200D\U0001F467",  # family
+        "\U0001F469\U0001F3FD\u200D\U0001F4BB",  # technologist, skin tone
+        "\U0001F3F3\uFE0F\u200D\U0001F308",  # rainbow flag
+        "\U0001F1FA\U0001F1F8",  # flag: US
+        "\U0001F3F4\U000E0067\U000E0062\U000E0073\U000E0063\U000E0074\U000E007F",  # flag: Scotland
+        "1\uFE0F\u20E3",  # keycap
+    ])
+    def test_emoji_sequences_count_two(self, emoji):
+        assert poster._tweet_length(emoji) == 2
+
+    def test_adjacent_flags_count_separately(self):
+        assert poster._tweet_length("\U0001F1FA\U0001F1F8\U0001F1EF\U0001F1F5") == 4
+
+    def test_thread_of_flags_fits_limit(self):
+        """140 flags is exactly 280, as X counts it."""
+        flags = "\U0001F1FA\U0001F1F8" * 140
+        assert poster._tweet_length(flags) == poster.MAX_TWEET_LENGTH
+        poster._check_thread([flags])
+
+
+class FakeClock:
+    """Stands in for time.monotonic() and time.time()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """Test the _RateLimiter token buckets."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(poster.time, "monotonic", clock)
+        monkeypatch.setattr(poster.time, "time", clock)
+        return clock
+
+    def test_reserve_is_free_until_bucket_empties(self, clock):
+        limiter = poster._RateLimiter({"endpoint": (2, 10)})
+        assert limiter.reserve("endpoint") == 0
+        assert limiter.reserve("endpoint") == 0
+        # One token refills every 5 seconds
+        assert limiter.reserve("endpoint") == pytest.approx(5)
+        assert limiter.reserve("endpoint") == pytest.approx(10)
+
+    def test_reserve_refills_over_time(self, clock):
+        limiter = poster._RateLimiter({"endpoint": (2, 10)})
+        limiter.reserve("endpoint")
+        limiter.reserve("endpoint")
+        clock.now += 10
+        assert limiter.reserve("endpoint") == 0
+        assert limiter.reserve("endpoint") == 0
+
+    def test_buckets_are_per_endpoint(self, clock):
+        limiter = poster._RateLimiter({"a": (1, 10), "b": (1, 10)})
+        limiter.reserve("a")
+        assert limiter.reserve("b") == 0
+
+    def test_drain_waits_out_server_reset(self, clock):
+        limiter = poster._RateLimiter({"endpoint": (2, 10)})
+        error = SimpleNamespace(
+            response=SimpleNamespace(headers={"x-rate-limit-reset": str(clock.now + 30)})
+        )
+        limiter.drain("endpoint", error)
+        assert limiter.reserve("endpoint") == pytest.approx(30)
+
+    def test_drain_without_reset_header(self, clock):
+        limiter = poster._RateLimiter({"endpoint": (2, 10)})
+        error = SimpleNamespace(response=SimpleNamespace(headers={}))
+        limiter.drain("endpoint", error)
+        assert limiter.reserve("endpoint") == 0
+
+
+class TestGetTweets:
+    """Test get_tweets() batching and ordering."""
+
+    @pytest.fixture
+    def lookups(self, monkeypatch):
+        lookups = []
+
+        def get_tweets(ids, tweet_fields):
+            lookups.append((ids, tweet_fields))
+            # Every third tweet is gone (deleted or protected)
+            data = [SimpleNamespace(id=tweet_id) for tweet_id in ids if tweet_id % 3]
+            return SimpleNamespace(data=data or None)
+
+        client = SimpleNamespace(get_tweets=get_tweets)
+        monkeypatch.setattr(poster, "get_client", lambda: client)
+        monkeypatch.setattr(
+            poster, "_rate_limited",
+            lambda endpoint, call, *args, **kwargs: call(*args, **kwargs)
+        )
+        return lookups
+
+    def test_looks_up_in_batches(self, lookups):
+        poster.get_tweets(range(1, 251))
+        assert [len(ids) for ids, _ in lookups] == [100, 100, 50]
+
+    def test_keeps_request_order_and_drops_missing(self, lookups):
+        tweet_ids = [5, "4", 3, 2, 1]
+        found = poster.get_tweets(tweet_ids)
+        assert list(found) == [5, 4, 2, 1]
+
+    def test_passes_tweet_fields(self, lookups):
+        poster.get_tweets([1])
+        poster.get_tweets([1], tweet_fields=None)
+        assert [fields for _, fields in lookups] == [poster.DEFAULT_TWEET_FIELDS, None]
+
+    def test_empty_batch_response(self, lookups):
+        assert poster.get_tweets([3, 6]) == {}
+
+
+class TestReadBatch:
+    """Test _read_batch() JSONL parsing."""
+
+    def test_reads_strings_and_objects_in_order(self, tmp_path):
+        path = tmp_path / "thread.jsonl"
+        path.write_text(
+            json.dumps("First tweet") + "\n"
+            + "\n"
+            + json.dumps({"text": "Second 🎉", "note": "ignored"}) + "\n"
+            + "   \n"
+            + json.dumps("Third") + "\n",
+            encoding="utf-8"
+        )
+        assert poster._read_batch(str(path)) == ["First tweet", "Second 🎉", "Third"]
+
+    def test_invalid_json_raises(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text("not json\n", encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            poster._read_batch(str(path))
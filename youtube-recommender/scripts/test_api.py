@@ -6,8 +6,13 @@ Tests both YouTube Data API and Invidious backends.
 
 import os
 import sys
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request, URLError
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared by every probe, so repeat requests to a host reuse its connection
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
 
 # Test YouTube API key
 def test_youtube_api():
@@ -30,19 +35,19 @@ def test_youtube_api():
             'maxResults': 1,
             'key': api_key
         }
-        url = f'https://www.googleapis.com/youtube/v3/search?{urlencode(params)}'
-
-        req = Request(url)
-        with urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                print('✅ YouTube Data API is working!')
-                print(f'   API Key: {api_key[:10]}...{api_key[-4:]}')
-                return True
-            else:
-                print(f'❌ API returned HTTP {response.status}')
-                return False
+        url = 'https://www.googleapis.com/youtube/v3/search'
+
+        response = SESSION.get(url, params=params, timeout=10)
+        if response.status_code == 200:
+            print('✅ YouTube Data API is working!')
+            print(f'   API Key: {api_key[:10]}...{api_key[-4:]}')
+            return True
+        else:
+            print(f'❌ API returned HTTP {response.status_code}')
+            return False
     except Exception as e:
-        print(f'❌ YouTube API test failed: {e}')
+        # The error message can include the request URL, key and all
+        print(f"❌ YouTube API test failed: {str(e).replace(api_key, '***')}")
         return False
 
 
@@ -54,14 +59,13 @@ def test_invidious(instance='invidious.snopyta.org'):
     try:
         url = f'https://{instance}/api/v1/search?q=test&type=video'
 
-        req = Request(url)
-        with urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                print(f'✅ Invidious instance is working!')
-                return True
-            else:
-                print(f'❌ Invidious returned HTTP {response.status}')
-                return False
+        response = SESSION.get(url, timeout=10)
+        if response.status_code == 200:
+            print(f'✅ Invidious instance is working!')
+            return True
+        else:
+            print(f'❌ Invidious returned HTTP {response.status_code}')
+            return False
     except Exception as e:
         print(f'❌ Invidious test failed: {e}')
         return False
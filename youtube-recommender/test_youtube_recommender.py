@@ -6,6 +6,8 @@ Tests use mocked API responses - no actual API calls required.
 
 import unittest
 from unittest.mock import patch, Mock
+from functools import lru_cache
+from types import MappingProxyType
 import sys
 import os
 
@@ -14,6 +16,38 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import youtube_recommender
 
+# YouTube Data API search response with a single video, shared by every test
+_SEARCH_RESPONSE = MappingProxyType({
+    'items': [
+        {
+            'id': {'videoId': 'test123'},
+            'snippet': {
+                'title': 'Test Video',
+                'channelTitle': 'Test Channel',
+                'publishedAt': '2026-02-01T00:00:00Z'
+            }
+        }
+    ]
+})
+
+
+@lru_cache(maxsize=None)
+def _videos_response(duration):
+    """YouTube Data API videos response for _SEARCH_RESPONSE's video, with the given ISO 8601 duration."""
+    return MappingProxyType({
+        'items': [
+            {
+                'statistics': {'viewCount': '10000', 'likeCount': '500'},
+                'contentDetails': {'duration': duration}
+            }
+        ]
+    })
+
+
+def _mock_pair(duration):
+    """make_request side_effect for search_youtube: the search response, then the videos response."""
+    return iter((_SEARCH_RESPONSE, _videos_response(duration)))
+
 
 class TestDurationFiltering(unittest.TestCase):
     """Test duration filter configuration."""
@@ -116,11 +150,15 @@ class TestScoringAlgorithm(unittest.TestCase):
 class TestGetRecommendations(unittest.TestCase):
     """Test the get_recommendations function."""
 
-    @patch('youtube_recommender.search_youtube')
-    def test_get_recommendations_filters_by_duration(self, mock_search):
+    def setUp(self):
+        self.patcher = patch('youtube_recommender.search_youtube')
+        self.mock_search = self.patcher.start()
+        self.addCleanup(self.patcher.stop)
+
+    def test_get_recommendations_filters_by_duration(self):
         """Test that results are filtered by duration."""
         # Mock response with videos of various lengths
-        mock_search.return_value = [
+        self.mock_search.return_value = [
             {'videoId': '1', 'title': 'Tiny', 'author': 'Channel A', 'lengthSeconds': 180,
              'viewCount': 10000, 'likeCount': 500, 'published': '2026-02-01T00:00:00Z'},
             {'videoId': '2', 'title': 'Short', 'author': 'Channel B', 'lengthSeconds': 600,
@@ -136,10 +174,9 @@ class TestGetRecommendations(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['title'], 'Short')
 
-    @patch('youtube_recommender.search_youtube')
-    def test_get_recommendations_sorts_by_score(self, mock_search):
+    def test_get_recommendations_sorts_by_score(self):
         """Test that results are sorted by score."""
-        mock_search.return_value = [
+        self.mock_search.return_value = [
             {'videoId': '1', 'title': 'Low Score', 'author': 'Channel A', 'lengthSeconds': 600,
              'viewCount': 1000, 'likeCount': 50, 'published': '2026-01-01T00:00:00Z'},
             {'videoId': '2', 'title': 'High Score', 'author': 'Channel B', 'lengthSeconds': 600,
@@ -159,11 +196,10 @@ class TestGetRecommendations(unittest.TestCase):
             youtube_recommender.get_recommendations('test', 'invalid')
         self.assertIn('Invalid duration', str(context.exception))
 
-    @patch('youtube_recommender.search_youtube')
-    def test_get_recommendations_num_results_limit(self, mock_search):
+    def test_get_recommendations_num_results_limit(self):
         """Test that num_results parameter limits output."""
         # Return 10 videos
-        mock_search.return_value = [
+        self.mock_search.return_value = [
             {'videoId': str(i), 'title': f'Video {i}', 'author': 'Channel', 'lengthSeconds': 600,
              'viewCount': 10000, 'likeCount': 500, 'published': '2026-02-01T00:00:00Z'}
             for i in range(10)
@@ -174,10 +210,9 @@ class TestGetRecommendations(unittest.TestCase):
 
         self.assertEqual(len(results), 3)
 
-    @patch('youtube_recommender.search_youtube')
-    def test_get_recommendations_empty_results(self, mock_search):
+    def test_get_recommendations_empty_results(self):
         """Test that empty search returns empty list."""
-        mock_search.return_value = []
+        self.mock_search.return_value = []
         results = youtube_recommender.get_recommendations('test', 'short', backend='youtube')
         self.assertEqual(results, [])
 
@@ -246,30 +281,8 @@ class TestYouTubeAPI(unittest.TestCase):
     @patch('youtube_recommender.make_request')
     def test_search_youtube_parses_duration_pt5m30s(self, mock_request):
         """Test parsing PT5M30S duration format."""
-        mock_request.side_effect = [
-            # Search response
-            {
-                'items': [
-                    {
-                        'id': {'videoId': 'test123'},
-                        'snippet': {
-                            'title': 'Test Video',
-                            'channelTitle': 'Test Channel',
-                            'publishedAt': '2026-02-01T00:00:00Z'
-                        }
-                    }
-                ]
-            },
-            # Videos response with PT5M30S (5 min 30 sec)
-            {
-                'items': [
-                    {
-                        'statistics': {'viewCount': '10000', 'likeCount': '500'},
-                        'contentDetails': {'duration': 'PT5M30S'}
-                    }
-                ]
-            }
-        ]
+        # Videos response with PT5M30S (5 min 30 sec)
+        mock_request.side_effect = _mock_pair('PT5M30S')
 
         videos = youtube_recommender.search_youtube('test', youtube_recommender.DURATION_FILTERS['short'])
         self.assertEqual(len(videos), 1)
@@ -278,28 +291,7 @@ class TestYouTubeAPI(unittest.TestCase):
     @patch('youtube_recommender.make_request')
     def test_search_youtube_parses_duration_pt1h30m(self, mock_request):
         """Test parsing PT1H30M duration format."""
-        mock_request.side_effect = [
-            {
-                'items': [
-                    {
-                        'id': {'videoId': 'test123'},
-                        'snippet': {
-                            'title': 'Test Video',
-                            'channelTitle': 'Test Channel',
-                            'publishedAt': '2026-02-01T00:00:00Z'
-                        }
-                    }
-                ]
-            },
-            {
-                'items': [
-                    {
-                        'statistics': {'viewCount': '10000', 'likeCount': '500'},
-                        'contentDetails': {'duration': 'PT1H30M'}
-                    }
-                ]
-            }
-        ]
+        mock_request.side_effect = _mock_pair('PT1H30M')
 
         videos = youtube_recommender.search_youtube('test', youtube_recommender.DURATION_FILTERS['long'])
         self.assertEqual(len(videos), 1)
@@ -308,34 +300,22 @@ class TestYouTubeAPI(unittest.TestCase):
     @patch('youtube_recommender.make_request')
     def test_search_youtube_parses_duration_pt30s(self, mock_request):
         """Test parsing PT30S duration format."""
-        mock_request.side_effect = [
-            {
-                'items': [
-                    {
-                        'id': {'videoId': 'test123'},
-                        'snippet': {
-                            'title': 'Test Video',
-                            'channelTitle': 'Test Channel',
-                            'publishedAt': '2026-02-01T00:00:00Z'
-                        }
-                    }
-                ]
-            },
-            {
-                'items': [
-                    {
-                        'statistics': {'viewCount': '10000', 'likeCount': '500'},
-                        'contentDetails': {'duration': 'PT30S'}
-                    }
-                ]
-            }
-        ]
+        mock_request.side_effect = _mock_pair('PT30S')
 
         videos = youtube_recommender.search_youtube('test', youtube_recommender.DURATION_FILTERS['tiny'])
         self.assertEqual(len(videos), 1)
         self.assertEqual(videos[0]['lengthSeconds'], 30)
 
 
+    def test_make_request_error_hides_api_key(self):
+        """Test connection errors don't echo the API key from the URL."""
+        url = 'https://127.0.0.1:1/youtube/v3/search?q=x&key=SECRETKEY123&part=id'
+        with self.assertRaises(Exception) as context:
+            youtube_recommender.make_request(url)
+        self.assertIn('Connection error', str(context.exception))
+        self.assertNotIn('SECRETKEY123', str(context.exception))
+
+
 class TestInvidiousAPI(unittest.TestCase):
     """Test Invidious API functionality with mocks."""
 
@@ -15,8 +15,15 @@ import json
 import time
 import math
 import re
+import heapq
 from urllib.parse import urlencode
-from urllib.request import urlopen, Request, URLError, HTTPError
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # Optional: the json module parses the same responses, just slower
+    orjson = None
 
 # Duration filters (in seconds)
 DURATION_FILTERS = {
@@ -25,6 +32,9 @@ DURATION_FILTERS = {
     'long': {'min': 1200, 'max': None}  # 20+ minutes
 }
 
+# ISO 8601 video duration from the YouTube Data API: PT((\d+)H)?((\d+)M)?((\d+)S)?
+DURATION_PATTERN = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
 # Invidious instances (updated list of known working instances)
 # Last updated: 2026-02-17
 INVIDIOUS_INSTANCES = [
@@ -43,26 +53,29 @@ YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
 BACKEND = os.environ.get('BACKEND', 'youtube' if YOUTUBE_API_KEY else 'invidious')
 INVIDIOUS_INSTANCE = os.environ.get('INVIDIOUS_INSTANCE', 'invidious.snopyta.org')
 
+# Shared across requests, so the search + videos calls to one host reuse a connection
+_session = requests.Session()
+
+# requests puts the full URL, API key included, into its error messages
+_KEY_PARAM_PATTERN = re.compile(r'([?&]key=)[^&\s\'"]+')
+
 
 def make_request(url):
     """Make HTTPS request with timeout."""
-    req = Request(url)
     try:
-        with urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                data = response.read().decode('utf-8')
-                try:
-                    return json.loads(data)
-                except json.JSONDecodeError as e:
-                    raise Exception(f'JSON parse error: {e}')
-            else:
-                raise Exception(f'HTTP {response.status}: {response.reason}')
-    except HTTPError as e:
-        raise Exception(f'HTTP {e.code}: {e.reason}')
-    except URLError as e:
-        raise Exception(f'Connection error: {e.reason}')
-    except Exception as e:
-        raise Exception(str(e))
+        response = _session.get(url, timeout=10)
+    except requests.RequestException as e:
+        message = _KEY_PARAM_PATTERN.sub(r'\1***', str(e))
+        raise Exception(f'Connection error: {message}')
+
+    if response.status_code != 200:
+        raise Exception(f'HTTP {response.status_code}: {response.reason}')
+
+    # Parse the raw bytes: response.text may first have to guess the charset
+    try:
+        return orjson.loads(response.content) if orjson else json.loads(response.content)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+        raise Exception(f'JSON parse error: {e}')
 
 
 # ==================== YouTube Data API ====================
@@ -128,9 +141,7 @@ def search_youtube(query, duration_filter):
         duration_str = stats['contentDetails']['duration']
 
         # Robust regex-based parser
-        # Pattern: PT((\d+)H)?((\d+)M)?((\d+)S)?
-        duration_pattern = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
-        match = duration_pattern.fullmatch(duration_str)
+        match = DURATION_PATTERN.fullmatch(duration_str)
 
         if match:
             hours = int(match.group(1)) if match.group(1) else 0
@@ -281,8 +292,14 @@ def time_ago(timestamp):
         return 'recently'
 
 
-def calculate_score(video):
-    """Calculate recommendation score for a video."""
+def calculate_score(video, now=None):
+    """Calculate recommendation score for a video.
+
+    ``now`` is the reference Unix time for the recency bonus; callers scoring
+    a whole result list pass one value so the clock is read once.
+    """
+    if now is None:
+        now = time.time()
     views = video.get('viewCount', 0)
     seconds = video.get('lengthSeconds', 0)
 
@@ -299,9 +316,9 @@ def calculate_score(video):
         if isinstance(video['published'], str):
             from datetime import datetime
             published_time = datetime.fromisoformat(video['published'].replace('Z', '+00:00'))
-            age_days = (time.time() - published_time.timestamp()) / 86400
+            age_days = (now - published_time.timestamp()) / 86400
         else:
-            age_days = (time.time() * 1000 - video['published']) / (1000 * 86400)
+            age_days = (now * 1000 - video['published']) / (1000 * 86400)
         recency_bonus = max(0, 5 - age_days / 30)
     except Exception:
         recency_bonus = 0
@@ -422,11 +439,10 @@ def get_recommendations(topic, duration='short', backend=None, num_results=5):
         if not filtered:
             return []
 
-        # Calculate scores and sort
-        scored = [{**v, 'score': calculate_score(v)} for v in filtered]
-        scored.sort(key=lambda x: x['score'], reverse=True)
-
-        return scored[:num_results]
+        # Calculate scores and keep the top results
+        now = time.time()
+        scored = [{**v, 'score': calculate_score(v, now)} for v in filtered]
+        return heapq.nlargest(num_results, scored, key=lambda x: x['score'])
 
     except Exception as error:
         if isinstance(error, (ValueError, APIKeyError)):